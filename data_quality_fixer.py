@@ -87,7 +87,7 @@ class DataQualityFixer:
                     donnees_corrigees[thematique] = {
                         'extraits_textuels': extraits_valides,
                         'mots_cles_trouves': donnees.get('mots_cles_trouves', []),
-                        'urls': list(set([e.get('url', '') for e in extraits_valides if e.get('url')])),
+                        'urls': list(dict.fromkeys(e.get('url', '') for e in extraits_valides if e.get('url'))),
                         'pertinence': self._calculer_nouvelle_pertinence(extraits_valides),
                         'type': donnees.get('type', 'recherche_corrigee'),
                         'qualite_score': self._evaluer_qualite_globale(extraits_valides),
@@ -26,6 +26,9 @@ from scripts.diagnostic_logger import DiagnosticLogger
 from ai_validation_module import AIValidationModule
 from data_quality_fixer import DataQualityFixer
 
+# Cache persistant des noms exclus par le filtreur PME (réutilisé d'une exécution à l'autre)
+CACHE_EXCLUSIONS_FILTREUR = "data/cache/exclusions_filtreur.json"
+
 def valider_configuration_pme():
     """Valide que la configuration PME est correcte"""
     print("[CONFIG] Validation de la configuration PME...")
@@ -279,7 +282,7 @@ def diagnostic_filtrage_complet(entreprises_brutes):
         print(f"[STATS] Entreprises avant filtrage: {len(entreprises_brutes)}")
         
         # Créer filtreur PME
-        filtreur = FiltreurPME()
+        filtreur = FiltreurPME(cache_exclusions=CACHE_EXCLUSIONS_FILTREUR)
         
         # Test filtrage territorial
         print(f"[TERRITOIRE] FILTRAGE TERRITORIAL:")
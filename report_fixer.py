@@ -292,14 +292,15 @@ class GenerateurRapports:
 
 def _strip_html(s): return (s or '').strip()
 
+# Heuristique : si trois <div ...> consécutifs ont même titre+desc+url -> n’en garder qu’un
+_EXTRAITS_DUPLIQUES_RE = re.compile(
+    r'(<div[^>]*>\s*<div[^>]*>\s*🌐[^<]*</div>\s*<div[^>]*>[^<]*</div>\s*(?:<div[^>]*>.*?</div>\s*)?</div>)(\s*\1)+',
+    re.DOTALL | re.IGNORECASE
+)
+
 def _fix_extraits_dupliques(html: str) -> str:
     """Supprime blocs d'extraits strictement identiques répétés à la suite."""
-    # Heuristique : si trois <div ...> consécutifs ont même titre+desc+url -> n’en garder qu’un
-    pattern = re.compile(
-        r'(<div[^>]*>\s*<div[^>]*>\s*🌐[^<]*</div>\s*<div[^>]*>[^<]*</div>\s*(?:<div[^>]*>.*?</div>\s*)?</div>)(\s*\1)+',
-        re.DOTALL | re.IGNORECASE
-    )
-    return re.sub(pattern, r'\1', html)
+    return _EXTRAITS_DUPLIQUES_RE.sub(r'\1', html)
 
 def _fix_noms_dupliques_commune(html: str) -> str:
     """Dans la carte 'Résumé par Commune', supprime les répétitions immédiates 'ARGEDIS, ARGEDIS'."""
@@ -383,12 +384,14 @@ def post_process_html(html: str) -> str:
             seen_prev = p
         return ' | '.join(result)
 
-    html = re.sub(
-        r'((?:[^<>]|<(?!/?(?:script|style)[^>]*>))+)',
-        lambda m: dedupe_pipe_segments(m.group(1)),
-        html,
-        flags=re.IGNORECASE
-    )
+    #    Sans aucun séparateur " | " dans la page, le passage par segment est inutile.
+    if ' | ' in html:
+        html = re.sub(
+            r'((?:[^<>]|<(?!/?(?:script|style)[^>]*>))+)',
+            lambda m: dedupe_pipe_segments(m.group(1)),
+            html,
+            flags=re.IGNORECASE
+        )
 
     # 4) Évite la répétition immédiate de mêmes balises simples (ex: <div>..</div><div>..</div> identiques collées)
     #    Ici on ne supprime pas, on insère une fine espace pour éviter "collage visuel" ; c’est safe.
@@ -252,11 +252,11 @@ class AnalyseurThematiques:
             nb_extraits_valides = len(donnees_converties['extraits_textuels'])
             donnees_converties['pertinence'] = min(nb_extraits_valides * 0.2, 0.8)
             
-            # Déduplication des URLs
-            donnees_converties['urls'] = list(set(donnees_converties['urls']))
+            # Déduplication des URLs (ordre de collecte conservé)
+            donnees_converties['urls'] = list(dict.fromkeys(donnees_converties['urls']))
             
-            # Déduplication des mots-clés
-            donnees_converties['mots_cles_trouves'] = list(set(donnees_converties['mots_cles_trouves']))
+            # Déduplication des mots-clés (ordre de collecte conservé)
+            donnees_converties['mots_cles_trouves'] = list(dict.fromkeys(donnees_converties['mots_cles_trouves']))
             
             print(f"           ✅ Conversion réussie: {nb_extraits_valides} extraits, pertinence {donnees_converties['pertinence']:.2f}")
             
@@ -591,7 +591,7 @@ class AnalyseurThematiques:
             urls_collectees.append(info['url'])
         
         if urls_collectees:
-            informations['urls_sources'] = list(set(urls_collectees))  # Dédupliqué
+            informations['urls_sources'] = list(dict.fromkeys(urls_collectees))  # Dédupliqué, ordre conservé
             print(f"           🌐 URLs: {len(urls_collectees)} collectées")
         
         # 8. ✅ PERTINENCE ET MÉTADONNÉES
@@ -1,35 +1,211 @@
-from typing import Dict, List
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+try:
+    import yaml
+    _HAS_YAML = True
+except ImportError:
+    _HAS_YAML = False
+
+logger = logging.getLogger(__name__)
+
+# Configuration par défaut si fichier manquant ou illisible
+_DEFAULT_CFG = {
+    'territoire': {
+        'codes_postaux_cibles': ['77600', '77700'],
+        'communes_prioritaires': ['Bussy-Saint-Georges']
+    },
+    'filtrage_pme': {
+        'effectif_max': 249,
+        'secteurs_prioritaires': ['commerce', 'services']
+    }
+}
+
+# Code postal français (5 chiffres)
+_CP_RE = re.compile(r'\b(\d{5})\b')
+
+# Civilité en tête de nom (personnes physiques)
+_CIV_RE = re.compile(r'^(?:MADAME|MONSIEUR|M\.|MME|MLLE) ')
+
+# Indicateurs d'entreprise (recherche en sous-chaîne, comme le test historique)
+_INDIC_RE = re.compile(r'SARL|SAS|SASU|EURL|SA|SNC|ENTREPRISE|SOCIETE|CABINET|ATELIER')
+
+# ❌ EXCLUSIONS STRICTES (vraiment non recherchables)
+_EXCLUSIONS_STRICTES = (
+    # Personnes physiques évidentes
+    'MADAME ', 'MONSIEUR ', 'M. ', 'MME ', 'MLLE ',
+    
+    # Informations non diffusibles
+    'INFORMATION NON-DIFFUSIBLE', 'NON DIFFUSIBLE', 'CONFIDENTIEL',
+    
+    # Organismes sans activité web
+    'BIBLIOTHEQUE NATIONALE DE FRANCE',  # Très spécifique
+    'CENTRE TECHNIQUE DU LIVRE',  # Très spécifique
+)
+
+# ✅ ORGANISATIONS À GARDER (ont une activité économique/communication)
+_ORGANISATIONS_ACTIVES = (
+    'SYNDICAT', 'INTERCOMMUNAL', 'MIXTE',  # Projets, développements
+    'AGENCE', 'OFFICE',  # Recrutements, événements
+    'CENTRE HOSPITALIER',  # Recrutements massifs
+    'FRANCE TRAVAIL',  # Actualités emploi
+    'ETABLISSEMENT PUBLIC'  # Projets, innovations
+)
+
+# ❌ EXCLUSIONS des organismes publics
+_EXCLUSIONS_ORGANISMES_PUBLICS = (
+    'FRANCE TRAVAIL', 'POLE EMPLOI', 'PREFECTURE', 'MAIRIE',
+    'CONSEIL GENERAL', 'CONSEIL DEPARTEMENTAL', 'CONSEIL REGIONAL',
+    'BIBLIOTHEQUE NATIONALE', 'CENTRE TECHNIQUE DU LIVRE',
+    'CENTRE HOSPITALIER', 'HOPITAL', 'CLINIQUE PUBLIQUE',
+    'SYNDICAT MIXTE', 'SYNDICAT INTERCOMMUNAL', 'COMMUNAUTE DE COMMUNES',
+    'ETABLISSEMENT PUBLIC', 'REGIE MUNICIPALE', 'SEM ', 'SEMOP',
+    'ASSOCIATION POUR', 'FONDATION POUR', 'FEDERATION',
+    'UNION NATIONALE', 'COMITE DEPARTEMENTAL'
+)
+
+# Noms commerciaux = plus recherchables sur le web
+_MOTS_COMMERCIAUX = (
+    'BOULANGERIE', 'RESTAURANT', 'CAFE', 'HOTEL', 'GARAGE',
+    'COIFFURE', 'PHARMACIE', 'OPTIQUE', 'MAGASIN', 'BOUTIQUE',
+    'CENTRE', 'INSTITUT', 'STUDIO', 'ATELIER', 'MAISON'
+)
+
+# Flags de classification d'un nom (voir FiltreurPME._construire_classifieur)
+_NOM_EXCLU = 1
+_NOM_COURT = 2
+_NOM_PERSONNE_PHYSIQUE = 4
+_NOM_PUBLIC = 8
+_NOM_COMMERCIAL = 16
+_NOM_ORG_ACTIVE = 32
+_NOM_NON_RECHERCHABLE = _NOM_EXCLU | _NOM_COURT | _NOM_PERSONNE_PHYSIQUE
+
+_MOTIFS_EXCLUSION = (
+    (_NOM_EXCLU, "Non recherchable"),
+    (_NOM_COURT, "Nom trop court"),
+    (_NOM_PERSONNE_PHYSIQUE, "Personne physique"),
+)
+
+
+# Signature des règles d'exclusion : invalide le cache persistant si elles changent
+_SIGNATURE_EXCLUSIONS = hashlib.md5(
+    repr((_EXCLUSIONS_STRICTES, _CIV_RE.pattern, _INDIC_RE.pattern)).encode('utf-8')
+).hexdigest()
+
+
+def _motif_exclusion(flags: int) -> str:
+    """Motif d'exclusion correspondant aux flags d'un nom ('' si recherchable)"""
+    for flag, motif in _MOTIFS_EXCLUSION:
+        if flags & flag:
+            return motif
+    return ""
 
 
 class FiltreurPME:
     """Filtrage spécifique pour identifier les vraies PME de votre territoire"""
     
-    def __init__(self, config_path="config/parametres.yaml"):
+    def __init__(self, config_path="config/parametres.yaml",
+                 cache_exclusions: Optional[str] = None):
         self.config = self._charger_config_territoire(config_path)
         
+        # Ensembles figés pour des tests d'appartenance en O(1)
+        territoire = self.config.get('territoire', {})
+        self._cp_cibles_set = frozenset(territoire.get('codes_postaux_cibles', []))
+        self._communes_set = frozenset(territoire.get('communes_prioritaires', []))
+        # Codes cibles numériques pour le test de proximité (département = code // 1000)
+        self._cp_cibles_arr = np.array(
+            [int(code) for code in self._cp_cibles_set if len(code) == 5 and code.isdigit()],
+            dtype=np.int64
+        )
+        
+        # Classification mémoïsée par nom normalisé (retraitements, lots qui se recouvrent)
+        self._classifier = lru_cache(maxsize=100_000)(self._construire_classifieur())
+        
+        # Noms normalisés déjà exclus lors des exécutions précédentes (cache désactivé si aucun chemin)
+        self.cache_exclusions = cache_exclusions
+        self._excl_cache = self._charger_cache_exclusions()
+        self._excl_cache_modifie = False
+        
     def _charger_config_territoire(self, config_path):
         """Chargement des codes postaux et critères PME"""
+        # Copie profonde : la configuration par défaut du module reste intacte
+        if not _HAS_YAML:
+            return copy.deepcopy(_DEFAULT_CFG)
+        
         try:
-            import yaml
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                return config
-        except:
-            # Configuration par défaut si fichier manquant
-            return {
-                'territoire': {
-                    'codes_postaux_cibles': ['77600', '77700'],
-                    'communes_prioritaires': ['Bussy-Saint-Georges']
-                },
-                'filtrage_pme': {
-                    'effectif_max': 249,
-                    'secteurs_prioritaires': ['commerce', 'services']
-                }
-            }
+                return yaml.safe_load(f) or copy.deepcopy(_DEFAULT_CFG)
+        except (OSError, ValueError, yaml.YAMLError):
+            # Fichier manquant, illisible, mal encodé (UnicodeDecodeError) ou YAML invalide
+            return copy.deepcopy(_DEFAULT_CFG)
+    
+    def _charger_cache_exclusions(self) -> Set[str]:
+        """Chargement du cache persistant des noms non recherchables"""
+        if not self.cache_exclusions:
+            return set()
+        
+        try:
+            with open(self.cache_exclusions, 'r', encoding='utf-8') as f:
+                contenu = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        
+        # Contenu inattendu ou règles modifiées depuis la sauvegarde → cache ignoré
+        if not isinstance(contenu, dict) or contenu.get('signature') != _SIGNATURE_EXCLUSIONS:
+            return set()
+        return set(contenu.get('noms', []))
+    
+    def save_cache(self) -> None:
+        """Sauvegarde du cache des exclusions (si modifié)"""
+        if not self.cache_exclusions or not self._excl_cache_modifie:
+            return
+        
+        try:
+            dossier = os.path.dirname(self.cache_exclusions)
+            if dossier:
+                os.makedirs(dossier, exist_ok=True)
+            # Écriture dans un fichier temporaire puis remplacement : jamais de cache tronqué
+            chemin_tmp = self.cache_exclusions + '.tmp'
+            with open(chemin_tmp, 'w', encoding='utf-8') as f:
+                json.dump({'signature': _SIGNATURE_EXCLUSIONS, 'noms': sorted(self._excl_cache)},
+                          f, ensure_ascii=False)
+            os.replace(chemin_tmp, self.cache_exclusions)
+            self._excl_cache_modifie = False
+        except OSError as e:
+            print(f"⚠️ Erreur sauvegarde cache exclusions: {e}")
+    
+    def _dedupe(self, entreprises: List[Dict]) -> List[Dict]:
+        """Élimine les doublons (même SIRET/SIREN + nom) en conservant le premier ; sans identifiant, gardée"""
+        vus = set()
+        uniques = []
+        ajouter_vu, ajouter = vus.add, uniques.append
+        for entreprise in entreprises:
+            identifiant = entreprise.get('siret') or entreprise.get('siren')
+            if identifiant:
+                cle = (identifiant, entreprise.get('nom') or '')
+                if cle in vus:
+                    continue
+                ajouter_vu(cle)
+            ajouter(entreprise)
+        
+        if len(uniques) < len(entreprises):
+            logger.info(f"🔄 Doublons ignorés avant filtrage: {len(entreprises) - len(uniques)}")
+        return uniques
     
     def filtrer_par_territoire(self, entreprises: List[Dict]) -> List[Dict]:
         """🎯 Filtrage par codes postaux de votre territoire"""
         
+        entreprises = self._dedupe(entreprises)
+        
         codes_postaux_cibles = self.config.get('territoire', {}).get('codes_postaux_cibles', [])
         communes_prioritaires = self.config.get('territoire', {}).get('communes_prioritaires', [])
         
@@ -38,131 +214,133 @@ class FiltreurPME:
         print(f"   🏘️  Communes prioritaires: {communes_prioritaires}")
         
         entreprises_territoire = []
+        ajouter = entreprises_territoire.append
+        trace = logger.isEnabledFor(logging.DEBUG)
         
-        for entreprise in entreprises:
-            adresse = entreprise.get('adresse_complete', '')
-            commune = entreprise.get('commune', '')
-            
-            # Extraction du code postal de l'adresse
-            code_postal_trouve = self._extraire_code_postal(adresse)
-            
-            est_dans_territoire = False
-            raison_selection = ""
+        # Extraction et tests vectorisés sur les seules colonnes utiles
+        adresses = pd.Series([e.get('adresse_complete', '') for e in entreprises], dtype=object)
+        communes = [e.get('commune', '') for e in entreprises]
+        
+        codes_postaux = adresses.str.extract(_CP_RE.pattern, expand=False).fillna('')
+        masque_cp = codes_postaux.isin(self._cp_cibles_set).to_numpy()
+        masque_commune = pd.Series(communes, dtype=object).isin(self._communes_set).to_numpy()
+        
+        # Proximité : même département + écart numérique <= 100 avec une cible
+        cp_int = pd.to_numeric(codes_postaux, errors='coerce').to_numpy(dtype=float)[:, None]
+        cibles = self._cp_cibles_arr[None, :]
+        masque_proche = ((np.abs(cp_int - cibles) <= 100) & (cp_int // 1000 == cibles // 1000)).any(axis=1)
+        
+        for entreprise, commune, code_postal_trouve, par_cp, par_commune, proche in zip(
+                entreprises, communes, codes_postaux.tolist(), masque_cp, masque_commune, masque_proche):
             
-            # Vérification code postal
-            if code_postal_trouve in codes_postaux_cibles:
-                est_dans_territoire = True
+            # Vérification code postal, puis commune, puis proximité
+            if par_cp:
                 raison_selection = f"Code postal {code_postal_trouve}"
                 entreprise['code_postal_detecte'] = code_postal_trouve
-                
-            # Vérification commune
-            elif commune in communes_prioritaires:
-                est_dans_territoire = True
+            elif par_commune:
                 raison_selection = f"Commune {commune}"
-                
-            # Vérification proximité (codes postaux proches)
-            elif self._est_code_postal_proche(code_postal_trouve, codes_postaux_cibles):
-                est_dans_territoire = True
+            elif proche:
                 raison_selection = f"Proximité {code_postal_trouve}"
                 entreprise['code_postal_detecte'] = code_postal_trouve
-            
-            if est_dans_territoire:
-                entreprise['raison_selection_territoire'] = raison_selection
-                entreprises_territoire.append(entreprise)
-                print(f"   ✅ {entreprise['nom'][:30]} - {raison_selection}")
             else:
-                print(f"   ❌ {entreprise['nom'][:30]} - Hors territoire")
+                if trace:
+                    logger.debug(f"   ❌ {entreprise['nom'][:30]} - Hors territoire")
+                continue
+            
+            entreprise['raison_selection_territoire'] = raison_selection
+            ajouter(entreprise)
+            if trace:
+                logger.debug(f"   ✅ {entreprise['nom'][:30]} - {raison_selection}")
         
         print(f"\n📊 Résultat filtrage territorial: {len(entreprises_territoire)}/{len(entreprises)} entreprises")
         return entreprises_territoire
     
-    def _extraire_code_postal(self, adresse: str) -> str:
-        """Extraction du code postal depuis l'adresse"""
-        import re
-        
-        # Recherche pattern code postal français (5 chiffres)
-        match = re.search(r'\b(\d{5})\b', adresse)
-        return match.group(1) if match else ""
+    def _normaliser_nom(self, entreprise: Dict) -> str:
+        """Nom en majuscules sans espaces superflus (l'entreprise n'est pas modifiée)"""
+        # str.upper() garde son chemin rapide ASCII en C : une table str.translate
+        # mesurée 10 à 30× plus lente ici
+        return str(entreprise.get('nom') or '').strip().upper()
     
-    def _est_code_postal_proche(self, code_postal: str, codes_cibles: List[str]) -> bool:
-        """Vérification si code postal est proche géographiquement"""
-        if not code_postal or len(code_postal) != 5:
-            return False
+    def _construire_classifieur(self):
+        """Fonction de classification d'un nom normalisé en flags _NOM_*, construite une fois"""
+        # Motifs et prédicats capturés dans la fermeture (pas de lookup global/attribut par appel)
+        exclusions_strictes = _EXCLUSIONS_STRICTES
+        exclusions_publiques = _EXCLUSIONS_ORGANISMES_PUBLICS
+        organisations_actives = _ORGANISATIONS_ACTIVES
+        mots_commerciaux = _MOTS_COMMERCIAUX
+        est_personne_physique = self._est_personne_physique_stricte
+        
+        def classifier_nom(nom: str) -> int:
+            flags = 0
+            
+            # ❌ TEST 1: Exclusions strictes seulement
+            if any(exclusion in nom for exclusion in exclusions_strictes):
+                flags |= _NOM_EXCLU
+            
+            # ❌ TEST 2: Noms trop courts ou vides
+            if len(nom) < 3:
+                flags |= _NOM_COURT
             
-        for code_cible in codes_cibles:
-            if len(code_cible) == 5:
-                # Codes postaux proches = même département + proche numériquement
-                if (code_postal[:2] == code_cible[:2] and  # Même département
-                    abs(int(code_postal) - int(code_cible)) <= 100):  # Proximité numérique
-                    return True
-        return False
+            # ❌ TEST 3: Personnes physiques (test plus fin)
+            if est_personne_physique(nom):
+                flags |= _NOM_PERSONNE_PHYSIQUE
+            
+            if any(exclusion in nom for exclusion in exclusions_publiques):
+                flags |= _NOM_PUBLIC
+            if any(mot in nom for mot in mots_commerciaux):
+                flags |= _NOM_COMMERCIAL
+            if any(org in nom for org in organisations_actives):
+                flags |= _NOM_ORG_ACTIVE
+            
+            return flags
+        
+        return classifier_nom
     
     def filtrer_pme_recherchables(self, entreprises: List[Dict]) -> List[Dict]:
         """Version ÉQUILIBRÉE - Élimine seulement les cas vraiment non recherchables"""
         
+        entreprises = self._dedupe(entreprises)
         entreprises_recherchables = []
-        
-        # ❌ EXCLUSIONS STRICTES (vraiment non recherchables)
-        exclusions_strictes = [
-            # Personnes physiques évidentes
-            'MADAME ', 'MONSIEUR ', 'M. ', 'MME ', 'MLLE ',
-            
-            # Informations non diffusibles
-            'INFORMATION NON-DIFFUSIBLE', 'NON DIFFUSIBLE', 'CONFIDENTIEL',
-            
-            # Organismes sans activité web
-            'BIBLIOTHEQUE NATIONALE DE FRANCE',  # Très spécifique
-            'CENTRE TECHNIQUE DU LIVRE',  # Très spécifique
-        ]
-        
-        # ✅ ORGANISATIONS À GARDER (ont une activité économique/communication)
-        organisations_actives = [
-            'SYNDICAT', 'INTERCOMMUNAL', 'MIXTE',  # Projets, développements
-            'AGENCE', 'OFFICE',  # Recrutements, événements
-            'CENTRE HOSPITALIER',  # Recrutements massifs
-            'FRANCE TRAVAIL',  # Actualités emploi
-            'ETABLISSEMENT PUBLIC'  # Projets, innovations
-        ]
-        
         stats = {'total': len(entreprises), 'exclus': 0, 'gardes': 0}
+        trace = logger.isEnabledFor(logging.DEBUG)
+        
+        # Méthodes liées en variables locales hors de la boucle
+        ajouter = entreprises_recherchables.append
+        normaliser_nom = self._normaliser_nom
+        classifier = self._classifier
+        excl_cache = self._excl_cache
         
         for entreprise in entreprises:
             try:
-                nom = entreprise.get('nom', '')
-                if not isinstance(nom, str):
-                    nom = str(nom) if nom is not None else ''
-                
-                nom = nom.strip().upper()
+                nom = normaliser_nom(entreprise)
                 
-                # ❌ TEST 1: Exclusions strictes seulement
-                est_non_recherchable = any(exclusion in nom for exclusion in exclusions_strictes)
-                
-                if est_non_recherchable:
+                # Exclu lors d'une exécution précédente : pas de reclassification
+                if nom in excl_cache:
                     stats['exclus'] += 1
-                    print(f"❌ Non recherchable: {nom[:50]}...")
+                    if trace:
+                        logger.debug(f"❌ Exclu (cache): {nom[:50]}...")
                     continue
                 
-                # ❌ TEST 2: Noms trop courts ou vides
-                if len(nom) < 3:
-                    stats['exclus'] += 1
-                    print(f"❌ Nom trop court: {nom}")
-                    continue
+                flags = classifier(nom)
                 
-                # ❌ TEST 3: Personnes physiques (test plus fin)
-                if self._est_personne_physique_stricte(nom):
+                if flags & _NOM_NON_RECHERCHABLE:
                     stats['exclus'] += 1
-                    print(f"❌ Personne physique: {nom[:50]}...")
+                    excl_cache.add(nom)
+                    self._excl_cache_modifie = True
+                    if trace:
+                        logger.debug(f"❌ {_motif_exclusion(flags)}: {nom[:50]}...")
                     continue
                 
                 # ✅ VALIDATION: Toutes les autres organisations sont gardées
-                entreprises_recherchables.append(entreprise)
+                ajouter(entreprise)
                 stats['gardes'] += 1
                 
-                # Classification pour information
-                if any(org in nom for org in organisations_actives):
-                    print(f"✅ Organisation active gardée: {nom[:50]}...")
-                else:
-                    print(f"✅ Entreprise gardée: {nom[:50]}...")
+                # Classification pour information (trace uniquement)
+                if trace:
+                    if flags & _NOM_ORG_ACTIVE:
+                        logger.debug(f"✅ Organisation active gardée: {nom[:50]}...")
+                    else:
+                        logger.debug(f"✅ Entreprise gardée: {nom[:50]}...")
                 
             except Exception as e:
                 print(f"❌ Erreur filtrage: {e}")
@@ -175,74 +353,45 @@ class FiltreurPME:
         print(f"   ❌ Non recherchables exclus: {stats['exclus']}")
         print(f"   ✅ Entreprises/Organisations gardées: {stats['gardes']}")
         
+        self.save_cache()
         return entreprises_recherchables
 
     def _est_personne_physique_stricte(self, nom: str) -> bool:
         """Test strict pour personnes physiques uniquement"""
         
         # Civilités au début
-        civilites = ['MADAME ', 'MONSIEUR ', 'M. ', 'MME ', 'MLLE ']
+        match = _CIV_RE.match(nom)
+        if not match:
+            return False
         
-        for civilite in civilites:
-            if nom.startswith(civilite):
-                nom_apres = nom.replace(civilite, '').strip()
-                mots = nom_apres.split()
-                
-                # Si seulement prénom + nom (max 2 mots) = personne physique
-                if len(mots) <= 2:
-                    return True
-                
-                # Si pas d'indicateur d'entreprise = personne physique
-                indicateurs_entreprise = [
-                    'SARL', 'SAS', 'SASU', 'EURL', 'SA', 'SNC',
-                    'ENTREPRISE', 'SOCIETE', 'CABINET', 'ATELIER'
-                ]
-                
-                if not any(indic in nom_apres for indic in indicateurs_entreprise):
-                    return True
+        nom_apres = nom[match.end():].strip()
         
-        return False
+        # Si seulement prénom + nom (max 2 mots) = personne physique
+        if len(nom_apres.split()) <= 2:
+            return True
+        
+        # Si pas d'indicateur d'entreprise = personne physique
+        return not _INDIC_RE.search(nom_apres)
 
     def _est_nom_commercial(self, nom: str) -> bool:
         """Détection nom commercial vs administratif"""
-        # Noms commerciaux = plus recherchables sur le web
-        mots_commerciaux = [
-            'BOULANGERIE', 'RESTAURANT', 'CAFE', 'HOTEL', 'GARAGE',
-            'COIFFURE', 'PHARMACIE', 'OPTIQUE', 'MAGASIN', 'BOUTIQUE',
-            'CENTRE', 'INSTITUT', 'STUDIO', 'ATELIER', 'MAISON'
-        ]
-        
-        return any(mot in nom for mot in mots_commerciaux)
+        return any(mot in nom for mot in _MOTS_COMMERCIAUX)
     
     def filtrer_organismes_publics(self, entreprises: List[Dict]) -> List[Dict]:
         """AJOUT SIMPLE : Élimine les organismes publics et parapublics"""
         
-        # ❌ EXCLUSIONS des organismes publics
-        exclusions_organismes_publics = [
-            'FRANCE TRAVAIL', 'POLE EMPLOI', 'PREFECTURE', 'MAIRIE',
-            'CONSEIL GENERAL', 'CONSEIL DEPARTEMENTAL', 'CONSEIL REGIONAL',
-            'BIBLIOTHEQUE NATIONALE', 'CENTRE TECHNIQUE DU LIVRE',
-            'CENTRE HOSPITALIER', 'HOPITAL', 'CLINIQUE PUBLIQUE',
-            'SYNDICAT MIXTE', 'SYNDICAT INTERCOMMUNAL', 'COMMUNAUTE DE COMMUNES',
-            'ETABLISSEMENT PUBLIC', 'REGIE MUNICIPALE', 'SEM ', 'SEMOP',
-            'ASSOCIATION POUR', 'FONDATION POUR', 'FEDERATION',
-            'UNION NATIONALE', 'COMITE DEPARTEMENTAL'
-        ]
-        
-        entreprises_privees = []
-        exclus = 0
+        normaliser_nom = self._normaliser_nom
+        classifier = self._classifier
         
-        for entreprise in entreprises:
-            nom = entreprise.get('nom', '').upper().strip()
-            
-            # Test d'exclusion
-            est_organisme_public = any(exclusion in nom for exclusion in exclusions_organismes_publics)
-            
-            if not est_organisme_public:
-                entreprises_privees.append(entreprise)
-            else:
-                exclus += 1
-                print(f"❌ Organisme public exclu: {nom[:50]}...")
+        # Test d'exclusion
+        entreprises_privees = [e for e in entreprises if not classifier(normaliser_nom(e)) & _NOM_PUBLIC]
+        exclus = len(entreprises) - len(entreprises_privees)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for entreprise in entreprises:
+                nom = normaliser_nom(entreprise)
+                if classifier(nom) & _NOM_PUBLIC:
+                    logger.debug(f"❌ Organisme public exclu: {nom[:50]}...")
         
         print(f"🔄 Filtrage organismes publics: {exclus} exclus, {len(entreprises_privees)} entreprises privées gardées")
 
@@ -5,13 +5,239 @@ Module de génération de rapports pour la veille économique
 Version modifiée pour le rapport HTML sans scores
 """
 
+import numpy as np
 import pandas as pd
 import json
+from bisect import bisect_left
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import os
 from pathlib import Path
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+try:
+    import xlsxwriter
+    _HAS_XLSXWRITER = True
+except ImportError:
+    # Repli sur le classeur write-only d'openpyxl (déjà requis pour lire les fichiers d'entrée)
+    _HAS_XLSXWRITER = False
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Options orjson alignées sur json.dump(indent=2) ; numpy et datetime sérialisés en natif
+_OPTIONS_ORJSON = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if _HAS_ORJSON else 0
+
+# Horodatage des noms de fichiers de rapports
+_FORMAT_HORODATAGE = "%Y%m%d_%H%M%S"
+
+# Tampon d'écriture des exports JSON (json.dump écrit par petits fragments)
+_TAILLE_TAMPON_ECRITURE = 1024 * 1024
+
+# Options du classeur Excel : écriture ligne par ligne à mémoire constante,
+# sans analyse des chaînes "http..." en hyperliens ; un infini restant devient #NUM! au lieu d'une exception
+_OPTIONS_CLASSEUR = {'constant_memory': True, 'strings_to_urls': False, 'nan_inf_to_errors': True}
+
+# Colonnes de la feuille principale, des feuilles par thématique et de la synthèse
+_COLONNES_PRINCIPAL = ('SIRET', 'Nom')
+_COLONNES_THEMATIQUE = ('Entreprise', 'Commune')
+_COLONNES_SYNTHESE = ('Thématique', 'Nb_Entreprises_Actives', 'Pourcentage_du_Total', 'Pourcentage_des_Actives',
+                      'Entreprises_Concernées', 'Secteurs_Représentés')
+
+# Parties statiques du rapport HTML, définies une fois au chargement du module
+# (le gabarit f-string n'interpole plus que les données ; indentation alignée sur le gabarit)
+_STYLE_RAPPORT = """<style>
+                body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
+                .container { max-width: 1200px; margin: 0 auto; background-color: white; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+                .header { background: linear-gradient(135deg, #2c3e50, #3498db); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+                .header h1 { margin: 0; font-size: 2.5em; font-weight: 300; }
+                .header p { margin: 10px 0 0 0; opacity: 0.9; }
+                
+                .resume-ia { background: linear-gradient(135deg, #e8f5e8, #f0f8f0); border-left: 5px solid #27ae60; margin: 20px; padding: 20px; border-radius: 8px; }
+                .resume-ia h2 { color: #27ae60; margin-top: 0; display: flex; align-items: center; }
+                .resume-ia h2::before { content: "🤖"; margin-right: 10px; }
+                .resume-points { list-style: none; padding: 0; }
+                .resume-points li { padding: 8px 0; border-bottom: 1px solid #e0e0e0; }
+                .resume-points li:last-child { border-bottom: none; }
+                .resume-points li::before { content: "▶"; color: #27ae60; margin-right: 10px; font-weight: bold; }
+                
+                .stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px; }
+                .stat-box { background: linear-gradient(135deg, #ecf0f1, #ffffff); padding: 20px; border-radius: 8px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+                .stat-box h3 { margin: 0; font-size: 2em; color: #2c3e50; }
+                .stat-box p { margin: 5px 0 0 0; color: #7f8c8d; font-weight: 500; }
+                
+                .section { margin: 20px; }
+                .section h2 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; display: flex; align-items: center; }
+                .section h2::before { margin-right: 10px; font-size: 1.2em; }
+                
+                .communes-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-top: 20px; }
+                .commune-card { background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }
+                .commune-card h4 { margin: 0 0 15px 0; color: #2c3e50; font-size: 1.3em; }
+                .commune-stats { display: flex; justify-content: space-between; margin-bottom: 15px; }
+                .commune-stat { text-align: center; }
+                .commune-stat .number { font-size: 1.5em; font-weight: bold; color: #3498db; }
+                .commune-stat .label { font-size: 0.9em; color: #7f8c8d; }
+                
+                .chart-container { background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin: 20px 0; }
+                .chart-wrapper { position: relative; height: 400px; }
+                
+                .entreprise { margin: 20px 0; padding: 25px; background: white; border: 1px solid #e0e0e0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }
+                .entreprise h4 { color: #2c3e50; margin: 0 0 15px 0; font-size: 1.4em; border-bottom: 2px solid #ecf0f1; padding-bottom: 10px; }
+                .entreprise-info { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px; background: #f8f9fa; padding: 15px; border-radius: 6px; }
+                .info-item { display: flex; flex-direction: column; }
+                .info-label { font-weight: bold; color: #34495e; font-size: 0.9em; }
+                .info-value { color: #2c3e50; margin-top: 5px; }
+                
+                .activites { margin: 15px 0; }
+                .activites-list { display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }
+                .activite-tag { background: linear-gradient(135deg, #3498db, #2980b9); color: white; padding: 6px 12px; border-radius: 20px; font-size: 0.9em; font-weight: 500; }
+                
+                .details-thematiques { margin-top: 25px; }
+                .thematique-detail { margin: 15px 0; padding: 20px; background: #f8f9fa; border-left: 4px solid #3498db; border-radius: 0 6px 6px 0; }
+                .thematique-detail h5 { color: #2c3e50; margin: 0 0 15px 0; font-size: 1.1em; }
+                .detail-item { margin: 10px 0; padding: 12px; background: white; border-radius: 6px; border: 1px solid #e9ecef; }
+                .detail-title { font-weight: bold; color: #34495e; margin-bottom: 8px; }
+                .detail-content { color: #2c3e50; line-height: 1.5; }
+                .detail-source { margin-top: 8px; }
+                .detail-source a { color: #3498db; text-decoration: none; font-size: 0.9em; }
+                .detail-source a:hover { text-decoration: underline; }
+            </style>"""
+
+_SCRIPT_GRAPHIQUE = """new Chart(ctx, {
+                    type: 'doughnut',
+                    data: {
+                        labels: thematiquesData.labels,
+                        datasets: [{
+                            data: thematiquesData.values,
+                            backgroundColor: [
+                                '#3498db', '#e74c3c', '#2ecc71', '#f39c12', 
+                                '#9b59b6', '#1abc9c', '#34495e', '#e67e22'
+                            ],
+                            borderWidth: 2,
+                            borderColor: '#ffffff'
+                        }]
+                    },
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        plugins: {
+                            legend: {
+                                position: 'right',
+                                labels: {
+                                    usePointStyle: true,
+                                    padding: 20,
+                                    font: {
+                                        size: 14
+                                    }
+                                }
+                            },
+                            tooltip: {
+                                callbacks: {
+                                    label: function(context) {
+                                        const total = context.dataset.data.reduce((a, b) => a + b, 0);
+                                        const percentage = ((context.parsed * 100) / total).toFixed(1);
+                                        return context.label + ': ' + context.parsed + ' entreprises (' + percentage + '%)';
+                                    }
+                                }
+                            }
+                        }
+                    }
+                });"""
+
+# Indicateurs de contenu générique/factice (extraits de remplissage produits en amont)
+_INDICATEURS_FACTICES = (
+    'information concernant',
+    'données contextuelles',
+    'activité économique locale',
+    'développement de l\'activité',
+    'services aux habitants',
+    'exemple.fr',
+    'exemple-local.fr',
+    'contexte entreprise'
+)
+
+# Marqueurs d'URL factice : sous-chaînes d'un extrait, domaines connus d'un lien affiché
+_MARQUEURS_URL_FACTICE = ('exemple', 'test', 'demo', 'simulation')
+_URLS_FACTICES = (
+    'exemple.fr',
+    'exemple-local.fr',
+    'test.fr',
+    'demo.fr',
+    'simulation.fr',
+    'salon-lagny-sur-marne.fr'  # URL générée par le système
+)
+
+# Préfixes des résumés d'événements par thématique (défaut : "Activité <thematique>")
+_RESUME_PREFIX = {
+    'recrutements': 'Recrutement détecté',
+    'evenements': 'Événement identifié',
+    'innovations': 'Innovation repérée',
+    'vie_entreprise': 'Développement entreprise',
+}
+
+# Thématiques surveillées par les alertes communes : activité détectée / concentration d'entreprises
+_THEMATIQUES_ALERTE_ACTIVITE = ('recrutements', 'innovations', 'vie_entreprise')
+_THEMATIQUES_ALERTE_CONCENTRATION = ('recrutements', 'innovations')
+
+# Niveaux de dynamisme du résumé IA : seuils (strictement dépassés) sur le % d'entreprises actives
+_SEUILS_DYNAMISME = (40, 70)
+_MESSAGES_DYNAMISME = (
+    "<strong>Territoire à potentiel</strong> : {pourcentage_actives}% d'activité détectée ({nb_actives} entreprises), nécessitant une approche ciblée pour stimuler le dynamisme économique.",
+    "<strong>Activité modérée</strong> : {pourcentage_actives}% des entreprises montrent des signes d'activité ({nb_actives} sur {nb_total}), avec des opportunités d'amélioration.",
+    "<strong>Territoire très dynamique</strong> : {pourcentage_actives}% des entreprises analysées présentent une activité détectable, soit {nb_actives} sur {nb_total} entreprises.",
+)
+
+
+@lru_cache(maxsize=None)
+def _titre_thematique(thematique: str) -> str:
+    """Libellé affichable d'une thématique ('vie_entreprise' -> 'Vie Entreprise'), mémorisé"""
+    return thematique.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=4096)
+def _premier_mot_secteur(secteur: str) -> str:
+    """Premier mot d'un libellé NAF (libellés très répétés d'une entreprise à l'autre), mémorisé"""
+    return secteur.partition(' ')[0]
+
+
+def _valeur_cellule(valeur):
+    """Valeur écrite dans une cellule Excel : None/NaN/NA donnent une cellule vide (comme DataFrame.to_excel)"""
+    if valeur is None or (pd.api.types.is_scalar(valeur) and pd.isna(valeur)):
+        return None
+    return valeur
+
+
+def _iter_extraits(resultat: Dict) -> Iterator[Dict]:
+    """Extraits textuels de tous les détails d'un résultat thématique, en un seul flux"""
+    return chain.from_iterable(
+        (detail.get('informations') or {}).get('extraits_textuels') or ()
+        for detail in resultat.get('details') or ()
+    )
+
+
+def _uniques_ordonnes(valeurs: Iterable, limite: Optional[int] = None) -> List:
+    """Valeurs sans doublon dans l'ordre de première apparition, arrêt dès `limite` atteinte"""
+    uniques = []
+    vus = set()
+    for valeur in valeurs:
+        if valeur in vus:
+            continue
+        vus.add(valeur)
+        uniques.append(valeur)
+        if len(uniques) == limite:
+            break
+    return uniques
+
+
 class GenerateurRapports:
     """Générateur de rapports multi-format pour la veille économique"""
     
@@ -20,79 +246,138 @@ class GenerateurRapports:
         self.dossier_sortie = Path(dossier_sortie)
         self.dossier_sortie.mkdir(parents=True, exist_ok=True)
         
-        self.thematiques = [
+        self.thematiques = (
             'evenements', 'recrutements', 'vie_entreprise', 'innovations',
             'exportations', 'aides_subventions', 'fondation_sponsor'
-        ]
+        )
+        
+        self._index_thematiques = {thematique: j for j, thematique in enumerate(self.thematiques)}
         
-    def generer_rapport_excel(self, entreprises_enrichies: List[Dict]) -> str:
+        # Noms de colonnes par thématique, formatés une seule fois
+        self._colonnes_count = {thematique: f'{thematique}_Count' for thematique in self.thematiques}
+        self._noms_feuilles = {thematique: _titre_thematique(thematique)[:31] for thematique in self.thematiques}  # Limite Excel
+        
+    def _precalculer(self, entreprises: List[Dict]) -> Dict:
+        """Parcours unique de analyse_thematique partagé par les différentes feuilles/sections
+        
+        Retourne 'trouve' (bool [N, T]), 'scores' (score_pertinence [N, T], 0 si non trouvé)
+        et 'scores_global' ([N]), colonnes dans l'ordre de self.thematiques.
+        """
+        n = len(entreprises)
+        trouve = np.zeros((n, len(self.thematiques)), dtype=bool)
+        scores = np.zeros((n, len(self.thematiques)))
+        
+        for i, entreprise in enumerate(entreprises):
+            analyse = entreprise.get('analyse_thematique') or {}
+            for j, thematique in enumerate(self.thematiques):
+                result = analyse.get(thematique)
+                if result and result.get('trouve', False):
+                    trouve[i, j] = True
+                    scores[i, j] = result.get('score_pertinence', 0)
+        
+        scores_global = np.fromiter((e.get('score_global', 0) for e in entreprises), dtype=float, count=n)
+        return {'trouve': trouve, 'scores': scores, 'scores_global': scores_global}
+        
+    def generer_rapport_excel(self, entreprises_enrichies: List[Dict], maintenant: Optional[datetime] = None) -> str:
         """Génération du rapport Excel enrichi"""
         print("📊 Génération du rapport Excel")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (maintenant or datetime.now()).strftime(_FORMAT_HORODATAGE)
         nom_fichier = f"veille_economique_{timestamp}.xlsx"
         chemin_fichier = self.dossier_sortie / nom_fichier
         
-        with pd.ExcelWriter(chemin_fichier, engine='openpyxl') as writer:
+        # Classeur xlsxwriter à mémoire constante (sinon openpyxl write-only) : lignes écrites directement,
+        # sans l'ExcelFormatter de pandas
+        if _HAS_XLSXWRITER:
+            classeur = xlsxwriter.Workbook(str(chemin_fichier), _OPTIONS_CLASSEUR)
+            format_entete = classeur.add_format({'bold': True})
+        else:
+            classeur = Workbook(write_only=True)
+            format_entete = Font(bold=True)
+        
+        try:
+            precalcul = self._precalculer(entreprises_enrichies)
             
-            # Feuille 1: Données enrichies principales
-            df_principal = self._creer_dataframe_principal(entreprises_enrichies)
-            df_principal.to_excel(writer, sheet_name='Données_Enrichies', index=False)
+            # Feuille 1: Données enrichies principales (lignes écrites au fil de l'eau)
+            self._ecrire_lignes(classeur, format_entete, 'Données_Enrichies', _COLONNES_PRINCIPAL,
+                                self._iter_lignes_principal(entreprises_enrichies, precalcul))
             
             # Feuille 2: Synthèse thématique
-            df_synthese = self._creer_dataframe_synthese(entreprises_enrichies)
-            df_synthese.to_excel(writer, sheet_name='Synthèse_Thématique', index=False)
+            df_synthese = self._creer_dataframe_synthese(entreprises_enrichies, precalcul)
+            self._ecrire_feuille(classeur, format_entete, 'Synthèse_Thématique', df_synthese)
             
-            # Feuille 3: Détails par thématique
-            for thematique in self.thematiques:
-                df_thematique = self._creer_dataframe_thematique(entreprises_enrichies, thematique)
-                if not df_thematique.empty:
-                    nom_feuille = thematique.replace('_', ' ').title()[:31]  # Limite Excel
-                    df_thematique.to_excel(writer, sheet_name=nom_feuille, index=False)
+            # Feuille 3: Détails par thématique (streamées, feuille créée seulement si au moins une ligne)
+            for j, thematique in enumerate(self.thematiques):
+                if not precalcul['trouve'][:, j].any():
+                    continue
+                lignes = self._iter_lignes_thematique(entreprises_enrichies, thematique, precalcul)
+                premiere = next(lignes, None)
+                if premiere is not None:
+                    self._ecrire_lignes(classeur, format_entete, self._noms_feuilles[thematique],
+                                        _COLONNES_THEMATIQUE, chain((premiere,), lignes))
                     
             # Feuille 4: Résumé par commune
-            df_communes = self._creer_dataframe_communes(entreprises_enrichies)
-            df_communes.to_excel(writer, sheet_name='Résumé_Communes', index=False)
+            df_communes = self._creer_dataframe_communes(entreprises_enrichies, precalcul)
+            self._ecrire_feuille(classeur, format_entete, 'Résumé_Communes', df_communes)
+        finally:
+            # Fermeture même en cas d'erreur : libère le fichier et les temporaires du mode constant_memory
+            if _HAS_XLSXWRITER:
+                classeur.close()
+        
+        if not _HAS_XLSXWRITER:
+            classeur.save(chemin_fichier)
             
         print(f"✅ Rapport Excel généré: {chemin_fichier}")
         return str(chemin_fichier)
         
+    def _ecrire_lignes(self, classeur, format_entete, nom_feuille: str,
+                       colonnes: Iterable[str], lignes: Iterable[Tuple]) -> None:
+        """Écriture d'un en-tête puis de lignes, dans l'ordre, dans une nouvelle feuille du classeur"""
+        if not _HAS_XLSXWRITER:
+            feuille = classeur.create_sheet(nom_feuille)
+            entete = []
+            for colonne in colonnes:
+                cellule = WriteOnlyCell(feuille, value=colonne)
+                cellule.font = format_entete
+                entete.append(cellule)
+            feuille.append(entete)
+            
+            for ligne in lignes:
+                feuille.append([_valeur_cellule(valeur) for valeur in ligne])
+            return
+        
+        feuille = classeur.add_worksheet(nom_feuille)
+        feuille.write_row(0, 0, colonnes, format_entete)
+        
+        for numero, ligne in enumerate(lignes, 1):
+            feuille.write_row(numero, 0, [_valeur_cellule(valeur) for valeur in ligne])
+        
+    def _ecrire_feuille(self, classeur, format_entete, nom_feuille: str, df: pd.DataFrame) -> None:
+        """Écriture d'un DataFrame dans une nouvelle feuille du classeur"""
+        self._ecrire_lignes(classeur, format_entete, nom_feuille, df.columns, df.itertuples(index=False, name=None))
+        
     def _creer_dataframe_principal(self, entreprises: List[Dict]) -> pd.DataFrame:
         """✅ CORRIGÉ: Seulement les entreprises avec activité RÉELLE"""
-        donnees = []
-        
-        # ✅ FILTRAGE STRICT - Score minimum relevé
-        for entreprise in entreprises:
+        return pd.DataFrame.from_records(self._iter_lignes_principal(entreprises), columns=_COLONNES_PRINCIPAL)
+    
+    def _iter_lignes_principal(self, entreprises: List[Dict], precalcul: Optional[Dict] = None) -> Iterator[Tuple]:
+        """Lignes de la feuille principale (ordre _COLONNES_PRINCIPAL), entreprises à activité réelle"""
+        nb_lignes = 0
+        precalcul = precalcul or self._precalculer(entreprises)
+        
+        # ✅ FILTRAGE STRICT - SEUIL RELEVÉ de 0.1 à 0.25, puis vérification activité réelle
+        for i in np.flatnonzero(precalcul['scores_global'] > 0.25):
+            entreprise = entreprises[i]
             score_global = entreprise.get('score_global', 0)
             
-            # ✅ SEUIL RELEVÉ et vérification activité réelle
-            if score_global <= 0.25:  # Relevé de 0.1 à 0.25
-                continue
-            
-            # ✅ VÉRIFICATION activité thématique réelle
-            analyse = entreprise.get('analyse_thematique', {})
-            a_vraie_activite = False
-            
-            for thematique, data in analyse.items():
-                if data.get('trouve', False) and data.get('score_pertinence', 0) > 0.3:
-                    # Vérifier qu'il y a du contenu substantiel
-                    details = data.get('details', [])
-                    if details:
-                        for detail in details:
-                            info = detail.get('informations', {})
-                            extraits = info.get('extraits_textuels', [])
-                            if extraits and len(extraits) > 0:
-                                # Vérifier la qualité des extraits
-                                for extrait in extraits:
-                                    titre = extrait.get('titre', '')
-                                    desc = extrait.get('description', '')
-                                    if len(titre) > 10 or len(desc) > 20:
-                                        a_vraie_activite = True
-                                        break
-                            if a_vraie_activite:
-                                break
-                    if a_vraie_activite:
-                        break
+            # ✅ VÉRIFICATION activité thématique réelle : au moins un extrait substantiel
+            analyse = entreprise.get('analyse_thematique') or {}
+            a_vraie_activite = any(
+                len(extrait.get('titre', '')) > 10 or len(extrait.get('description', '')) > 20
+                for data in analyse.values()
+                if data.get('trouve', False) and data.get('score_pertinence', 0) > 0.3
+                for extrait in _iter_extraits(data)
+            )
             
             if not a_vraie_activite:
                 print(f"     ⚪ Exclu (pas d'activité substantielle): {entreprise.get('nom', 'N/A')}")
@@ -100,17 +385,10 @@ class GenerateurRapports:
             
             print(f"     ✅ Inclus (activité validée): {entreprise.get('nom', 'N/A')} - Score: {score_global:.3f}")
             
-            # Votre code existant pour créer la ligne...
-            ligne = {
-                'SIRET': entreprise.get('siret', ''),
-                'Nom': entreprise.get('nom', ''),
-                # ... reste de vos colonnes existantes
-            }
-            
-            donnees.append(ligne)
+            nb_lignes += 1
+            yield (entreprise.get('siret', ''), entreprise.get('nom', ''))
         
-        print(f"📊 DataFrame principal: {len(donnees)} entreprises avec activité substantielle")
-        return pd.DataFrame(donnees)
+        print(f"📊 DataFrame principal: {nb_lignes} entreprises avec activité substantielle")
 
 
     def _determiner_activite_principale(self, resume_par_thematique: Dict[str, str]) -> str:
@@ -118,83 +396,62 @@ class GenerateurRapports:
         if not resume_par_thematique:
             return "Aucune activité détectée"
         
-        # Trouve la thématique avec le plus d'informations
-        thematique_principale = max(resume_par_thematique.items(), key=lambda x: len(x[1]))
+        # Trouve la thématique avec le plus d'informations (première en cas d'égalité)
+        thematique, resume, longueur_max = '', '', -1
+        for cle, texte in resume_par_thematique.items():
+            if len(texte) > longueur_max:
+                thematique, resume, longueur_max = cle, texte, len(texte)
         
-        if thematique_principale[1]:  # Si il y a du contenu
-            nom_thematique = thematique_principale[0].replace('_', ' ').title()
-            return f"{nom_thematique}: {thematique_principale[1][:100]}..."
+        if resume:  # Si il y a du contenu
+            return f"{_titre_thematique(thematique)}: {resume[:100]}..."
         
         return "Informations limitées"
         
-    def _creer_dataframe_thematique(self, entreprises: List[Dict], thematique: str) -> pd.DataFrame:
+    def _creer_dataframe_thematique(self, entreprises: List[Dict], thematique: str,
+                                    precalcul: Optional[Dict] = None) -> pd.DataFrame:
         """✅ CORRIGÉ: Seulement entreprises avec contenu de QUALITÉ pour la thématique"""
-        donnees_thematique = []
-        
-        for entreprise in entreprises:
-            analyse = entreprise.get('analyse_thematique', {})
+        return pd.DataFrame.from_records(self._iter_lignes_thematique(entreprises, thematique, precalcul),
+                                         columns=_COLONNES_THEMATIQUE)
+
+    def _iter_lignes_thematique(self, entreprises: List[Dict], thematique: str,
+                                precalcul: Optional[Dict] = None) -> Iterator[Tuple]:
+        """Lignes d'une feuille thématique (ordre _COLONNES_THEMATIQUE)"""
+        precalcul = precalcul or self._precalculer(entreprises)
+        j = self._index_thematiques[thematique]
+        
+        # ✅ VALIDATION QUALITÉ RENFORCÉE : trouvée avec score > 0.4 (seuil relevé)
+        candidats = np.flatnonzero(precalcul['trouve'][:, j] & (precalcul['scores'][:, j] > 0.4))
+        
+        for i in candidats:
+            entreprise = entreprises[i]
+            result = entreprise['analyse_thematique'][thematique]
+            # ✅ VÉRIFICATION contenu substantiel
+            if not result.get('details'):
+                continue
             
-            if thematique in analyse and analyse[thematique].get('trouve', False):
-                result = analyse[thematique]
-                
-                # ✅ VALIDATION QUALITÉ RENFORCÉE
-                score_pertinence = result.get('score_pertinence', 0)
-                if score_pertinence <= 0.4:  # Seuil relevé
-                    continue
-                
-                # ✅ VÉRIFICATION contenu substantiel
-                details = result.get('details', [])
-                if not details:
-                    continue
+            extraits_qualite = []
+            for extrait in _iter_extraits(result):
+                titre = extrait.get('titre', '')
+                description = extrait.get('description', '')
                 
-                extraits_qualite = []
-                for detail in details:
-                    info = detail.get('informations', {})
-                    extraits = info.get('extraits_textuels', [])
-                    
-                    for extrait in extraits:
-                        titre = extrait.get('titre', '')
-                        description = extrait.get('description', '')
-                        
-                        # ✅ VALIDATION contenu
-                        if len(titre) > 15 or len(description) > 30:
-                            # Vérifier que ce n'est pas du contenu générique
-                            if not self._est_contenu_generique(titre, description):
-                                extraits_qualite.append(extrait)
-                
-                if not extraits_qualite:
-                    print(f"     ⚪ {thematique} - Exclu (pas de contenu de qualité): {entreprise['nom']}")
-                    continue
-                
-                print(f"     ✅ {thematique} - Inclus: {entreprise['nom']} ({len(extraits_qualite)} extraits)")
-                
-                # Votre code existant pour créer la ligne...
-                ligne = {
-                    'Entreprise': entreprise['nom'],
-                    'Commune': entreprise['commune'],
-                    # ... reste de votre code existant
-                }
-                donnees_thematique.append(ligne)
-        
-        return pd.DataFrame(donnees_thematique)
+                # ✅ VALIDATION contenu
+                if len(titre) > 15 or len(description) > 30:
+                    # Vérifier que ce n'est pas du contenu générique
+                    if not self._est_contenu_generique(titre, description):
+                        extraits_qualite.append(extrait)
+            
+            if not extraits_qualite:
+                print(f"     ⚪ {thematique} - Exclu (pas de contenu de qualité): {entreprise['nom']}")
+                continue
+            
+            print(f"     ✅ {thematique} - Inclus: {entreprise['nom']} ({len(extraits_qualite)} extraits)")
+            
+            yield (entreprise['nom'], entreprise['commune'])
 
     def _est_contenu_generique(self, titre: str, description: str) -> bool:
         """✅ NOUVEAU: Détecte le contenu générique/factice"""
         texte_complet = f"{titre} {description}".lower()
-        
-        # Indicateurs de contenu générique
-        indicateurs_generiques = [
-            'information concernant',
-            'données contextuelles',
-            'activité économique locale',
-            'développement de l\'activité',
-            'services aux habitants',
-            'exemple.fr',
-            'exemple-local.fr',
-            'contexte entreprise'
-        ]
-        
-        return any(indicateur in texte_complet for indicateur in indicateurs_generiques)    
+        return any(indicateur in texte_complet for indicateur in _INDICATEURS_FACTICES)
     
     def _extraire_resume_evenement(self, details_evenements: List[Dict], thematique: str) -> str:
         """Extraction d'un résumé intelligent de l'événement"""
@@ -212,116 +469,113 @@ class GenerateurRapports:
             return ""
         
         # Résumé intelligent selon la thématique
-        if thematique == 'recrutements':
-            return f"Recrutement détecté: {' | '.join(contenus)}"
-        elif thematique == 'evenements':
-            return f"Événement identifié: {' | '.join(contenus)}"
-        elif thematique == 'innovations':
-            return f"Innovation repérée: {' | '.join(contenus)}"
-        elif thematique == 'vie_entreprise':
-            return f"Développement entreprise: {' | '.join(contenus)}"
-        else:
-            return f"Activité {thematique}: {' | '.join(contenus)}"
+        prefixe = _RESUME_PREFIX.get(thematique) or f"Activité {thematique}"
+        return f"{prefixe}: {' | '.join(contenus)}"
         
-    def _creer_dataframe_communes(self, entreprises: List[Dict]) -> pd.DataFrame:
+    def _creer_dataframe_communes(self, entreprises: List[Dict], precalcul: Optional[Dict] = None) -> pd.DataFrame:
         """Résumé par commune SANS SCORES - Seulement communes avec activité"""
         communes_stats = {}
-        entreprises_actives = [e for e in entreprises if e.get('score_global', 0) > 0.1]
+        precalcul = precalcul or self._precalculer(entreprises)
+        indices_actifs = np.flatnonzero(precalcul['scores_global'] > 0.1)
+        if not len(indices_actifs):
+            return pd.DataFrame()
 
-        for e in entreprises_actives:
+        # Code de groupe = rang d'apparition de la commune, avec les mêmes clés que communes_stats
+        # (None et chaque NaN distinct restent des groupes séparés, contrairement à groupby(dropna=False))
+        rangs = {}
+        codes_communes = np.empty(len(indices_actifs), dtype=np.int64)
+        for k, i in enumerate(indices_actifs):
+            e = entreprises[i]
             commune = e.get('commune', 'Inconnue')
-            if commune not in communes_stats:
-                communes_stats[commune] = {
-                    'entreprises': {},  # <- dict pour dédup SIRET+Nom
-                    'thematiques_count': {thematique: 0 for thematique in self.thematiques}
-                }
             cle = f"{e.get('siret','')}_{e.get('nom','')}".strip('_')
-            communes_stats[commune]['entreprises'][cle] = e  # overwrite safe (dédup)
+            communes_stats.setdefault(commune, {})[cle] = e  # <- dict pour dédup SIRET+Nom, overwrite safe
+            codes_communes[k] = rangs.setdefault(commune, len(rangs))
 
-            analyse = e.get('analyse_thematique', {})
-            for thematique in self.thematiques:
-                if analyse.get(thematique, {}).get('trouve', False):
-                    communes_stats[commune]['thematiques_count'][thematique] += 1
+        # Comptages par thématique agrégés par pandas sur ces codes (ordre d'apparition, comme communes_stats)
+        comptes_communes = pd.DataFrame(
+            precalcul['trouve'][indices_actifs].astype(int), columns=list(self._colonnes_count.values())
+        ).groupby(codes_communes, sort=True).sum().to_numpy()
+
+        # Thématique dominante de chaque commune (première en cas d'égalité)
+        dominantes = comptes_communes.argmax(axis=1)
 
-        # Création du DataFrame
-        donnees_communes = []
-        for commune, stats in communes_stats.items():
-            entreprises_commune = list(stats['entreprises'].values())
+        # Colonnes texte remplies commune par commune
+        noms_communes, nb_actives, entreprises_noms, secteurs_presents = [], [], [], []
+        for commune, uniques in communes_stats.items():
+            entreprises_commune = list(uniques.values())
 
             # Noms sans doublon et triés alpha pour la lisibilité
             noms_uniques = sorted({ec['nom'] for ec in entreprises_commune})
 
-            ligne = {
-                'Commune': commune,
-                'Nb_Entreprises_Actives': len(entreprises_commune),
-                'Entreprises_Noms': ', '.join(noms_uniques),  # <- plus de doublons "X, X"
-                'Secteurs_Présents': ', '.join(list(set([
-                    ec.get('secteur_naf', 'Non spécifié').split(' ')[0]
-                    for ec in entreprises_commune
-                ]))),
-            }
-            for thematique in self.thematiques:
-                ligne[f'{thematique}_Count'] = stats['thematiques_count'][thematique]
+            noms_communes.append(commune)
+            nb_actives.append(len(entreprises_commune))
+            entreprises_noms.append(', '.join(noms_uniques))  # <- plus de doublons "X, X"
+            secteurs_presents.append(', '.join(_uniques_ordonnes(
+                _premier_mot_secteur(ec.get('secteur_naf', 'Non spécifié'))
+                for ec in entreprises_commune
+            )))
 
-            thematique_dominante = max(stats['thematiques_count'].items(), key=lambda x: x[1])
-            ligne['Thématique_Dominante'] = thematique_dominante[0] if thematique_dominante[1] > 0 else 'Aucune'
+        # Création du DataFrame colonne par colonne, types fixés (pas d'inférence ligne à ligne)
+        lignes = np.arange(len(noms_communes))
+        return pd.DataFrame({
+            'Commune': np.array(noms_communes, dtype=object),
+            'Nb_Entreprises_Actives': np.array(nb_actives, dtype=np.int64),
+            'Entreprises_Noms': np.array(entreprises_noms, dtype=object),
+            'Secteurs_Présents': np.array(secteurs_presents, dtype=object),
+            **{colonne: comptes_communes[:, j] for j, colonne in enumerate(self._colonnes_count.values())},
+            'Thématique_Dominante': np.where(comptes_communes[lignes, dominantes] > 0,
+                                             np.array(self.thematiques, dtype=object)[dominantes], 'Aucune'),
+        })
 
-            donnees_communes.append(ligne)
 
-        return pd.DataFrame(donnees_communes)
-
-
-    def _creer_dataframe_synthese(self, entreprises: List[Dict]) -> pd.DataFrame:
+    def _creer_dataframe_synthese(self, entreprises: List[Dict], precalcul: Optional[Dict] = None) -> pd.DataFrame:
         """Synthèse SANS SCORES - Focus quantitatif et qualitatif"""
         donnees_synthese = []
+        precalcul = precalcul or self._precalculer(entreprises)
         
         # ✅ FILTRAGE : Seulement entreprises actives
-        entreprises_actives = [e for e in entreprises if e.get('score_global', 0) > 0.1]
+        masque_actives = precalcul['scores_global'] > 0.1
+        entreprises_actives = np.flatnonzero(masque_actives)
         
-        for thematique in self.thematiques:
+        for j, thematique in enumerate(self.thematiques):
             # Ensemble d'entreprises uniques (SIRET+Nom) concernées par la thématique
             uniques_par_theme = {}
-            for e in entreprises_actives:
-                et = e.get('analyse_thematique', {}).get(thematique, {})
-                if et.get('trouve', False):
-                    cle = f"{e.get('siret','')}_{e.get('nom','')}".strip('_')
-                    if cle not in uniques_par_theme:
-                        uniques_par_theme[cle] = e
+            for i in np.flatnonzero(masque_actives & precalcul['trouve'][:, j]):
+                e = entreprises[i]
+                cle = f"{e.get('siret','')}_{e.get('nom','')}".strip('_')
+                if cle not in uniques_par_theme:
+                    uniques_par_theme[cle] = e
 
             entreprises_concernees = list(uniques_par_theme.values())
 
             if entreprises_concernees:
-                # Liste des noms sans doublon
-                noms_uniques = []
-                vus = set()
-                for e in entreprises_concernees:
-                    nom = e['nom']
-                    if nom not in vus:
-                        vus.add(nom)
-                        noms_uniques.append(nom)
-                ligne = {
-                    'Thématique': thematique.replace('_', ' ').title(),
-                    'Nb_Entreprises_Actives': len(entreprises_concernees),
-                    'Pourcentage_du_Total': round((len(entreprises_concernees) / len(entreprises)) * 100, 1) if len(entreprises) else 0,
-                    'Pourcentage_des_Actives': round((len(entreprises_concernees) / len(entreprises_actives)) * 100, 1) if len(entreprises_actives) else 0,
-                    'Entreprises_Concernées': ', '.join(noms_uniques[:5]),
-                    'Secteurs_Représentés': ', '.join(list(set([
-                        e.get('secteur_naf', 'Non spécifié')[:30] + '...' 
-                        if len(e.get('secteur_naf', '')) > 30 
-                        else e.get('secteur_naf', 'Non spécifié')
-                        for e in entreprises_concernees
-                    ])))
-                }
+                # 5 premiers noms sans doublon
+                noms_uniques = _uniques_ordonnes((e['nom'] for e in entreprises_concernees), 5)
+                # Ligne dans l'ordre de _COLONNES_SYNTHESE
+                ligne = (
+                    _titre_thematique(thematique),
+                    len(entreprises_concernees),
+                    round((len(entreprises_concernees) / len(entreprises)) * 100, 1) if len(entreprises) else 0,
+                    round((len(entreprises_concernees) / len(entreprises_actives)) * 100, 1) if len(entreprises_actives) else 0,
+                    ', '.join(noms_uniques),
+                    ', '.join(_uniques_ordonnes(
+                        secteur[:30] + '...' if len(secteur) > 30 else secteur
+                        for secteur in (e.get('secteur_naf', 'Non spécifié') for e in entreprises_concernees)
+                    ))
+                )
                 donnees_synthese.append(ligne)
 
                 
-        return pd.DataFrame(donnees_synthese)
+        if not donnees_synthese:
+            return pd.DataFrame()
+        return pd.DataFrame.from_records(donnees_synthese, columns=_COLONNES_SYNTHESE)
 
-    def generer_rapport_html(self, entreprises_enrichies: List[Dict]) -> str:
+    def generer_rapport_html(self, entreprises_enrichies: List[Dict], maintenant: Optional[datetime] = None) -> str:
         """✅ Génération HTML SANS SCORES - Version adaptée"""
         print("🌐 Génération du rapport HTML (sans scores)")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        maintenant = maintenant or datetime.now()  # une seule lecture : nom de fichier et contenu cohérents
+        timestamp = maintenant.strftime(_FORMAT_HORODATAGE)
         nom_fichier = f"rapport_veille_{timestamp}.html"
         chemin_fichier = self.dossier_sortie / nom_fichier
         
@@ -329,14 +583,16 @@ class GenerateurRapports:
         stats_globales = self._calculer_statistiques_sans_scores(entreprises_enrichies)
             
         # Génération du HTML
-        html_content = self._generer_html_template_sans_scores(entreprises_enrichies, stats_globales)
+        html_content = self._generer_html_template_sans_scores(entreprises_enrichies, stats_globales, maintenant)
 
         # 🔧 Post-traitement HTML (suppression des petites répétitions)
         from report_fixer import post_process_html  # import local pour éviter cycles si besoin
         html_content = post_process_html(html_content)
 
-        with open(chemin_fichier, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Écriture atomique : fichier temporaire puis renommage, jamais de rapport tronqué
+        chemin_tmp = chemin_fichier.with_name(chemin_fichier.name + '.tmp')
+        chemin_tmp.write_text(html_content, encoding='utf-8')
+        os.replace(chemin_tmp, chemin_fichier)
        
         print(f"✅ Rapport HTML généré: {chemin_fichier}")
         return str(chemin_fichier)
@@ -344,51 +600,43 @@ class GenerateurRapports:
     def _calculer_statistiques_sans_scores(self, entreprises: List[Dict]) -> Dict:
         """✅ CORRIGÉ: Statistiques basées sur activité RÉELLE validée"""
         
-        def est_reellement_active(e: Dict) -> bool:
-            """Vérifie si l'entreprise a une activité SUBSTANTIELLE"""
-            # Score minimum
-            if e.get('score_global', 0) < 0.25:  # Relevé
-                return False
-            
+        def a_contenu_substantiel(e: Dict) -> bool:
+            """Vérifie si l'entreprise a une activité SUBSTANTIELLE (score minimum déjà vérifié)"""
             # Vérification thématiques avec contenu réel
             res = e.get('analyse_thematique', {})
             for theme_data in res.values():
                 if theme_data.get('trouve', False) and theme_data.get('score_pertinence', 0) > 0.4:
                     # Vérifier contenu substantiel
-                    details = theme_data.get('details', [])
-                    for detail in details:
-                        info = detail.get('informations', {})
-                        extraits = info.get('extraits_textuels', [])
-                        for extrait in extraits:
-                            titre = extrait.get('titre', '')
-                            desc = extrait.get('description', '')
-                            if (len(titre) > 15 or len(desc) > 30) and not self._est_contenu_generique(titre, desc):
-                                return True
+                    for extrait in _iter_extraits(theme_data):
+                        titre = extrait.get('titre', '')
+                        desc = extrait.get('description', '')
+                        if (len(titre) > 15 or len(desc) > 30) and not self._est_contenu_generique(titre, desc):
+                            return True
             return False
 
         nb_total = len(entreprises)
-        entreprises_actives = [e for e in entreprises if est_reellement_active(e)]
+        precalcul = self._precalculer(entreprises)
+        # Score minimum (relevé) vectorisé, contenu vérifié seulement pour les entreprises restantes ;
+        # évaluée une seule fois par entreprise, réutilisée pour chaque thématique
+        actives = precalcul['scores_global'] >= 0.25
+        candidats = np.flatnonzero(actives)
+        actives[candidats] = [a_contenu_substantiel(entreprises[i]) for i in candidats]
+        nb_actives = int(actives.sum())
 
         stats = {
             'nb_total': nb_total,
-            'nb_actives': len(entreprises_actives),
-            'pourcentage_actives': round((len(entreprises_actives) / nb_total) * 100, 1) if nb_total else 0.0,
+            'nb_actives': nb_actives,
+            'pourcentage_actives': round((nb_actives / nb_total) * 100, 1) if nb_total else 0.0,
             'nb_communes': len({(e.get('commune') or '').strip() for e in entreprises if (e.get('commune') or '').strip()}),
             'thematiques_stats': {}
         }
 
         # ✅ STATISTIQUES THÉMATIQUES avec validation
-        for thematique in self.thematiques:
-            entreprises_thematique = []
-            for e in entreprises:
-                if est_reellement_active(e):
-                    theme_data = e.get('analyse_thematique', {}).get(thematique, {})
-                    if theme_data.get('trouve', False) and theme_data.get('score_pertinence', 0) > 0.4:
-                        entreprises_thematique.append(e)
-            
+        comptes = (precalcul['trouve'] & (precalcul['scores'] > 0.4) & actives[:, None]).sum(axis=0)
+        for thematique, count in zip(self.thematiques, comptes.tolist()):
             stats['thematiques_stats'][thematique] = {
-                'count': len(entreprises_thematique),
-                'percentage': round((len(entreprises_thematique) / nb_total) * 100, 1) if nb_total else 0.0
+                'count': count,
+                'percentage': round((count / nb_total) * 100, 1) if nb_total else 0.0
             }
 
         print(f"📊 Statistiques QUALITÉ: {stats['nb_actives']}/{nb_total} entreprises avec activité réelle")
@@ -418,7 +666,8 @@ class GenerateurRapports:
         }
 
         
-    def _generer_html_template_sans_scores(self, entreprises: List[Dict], stats: Dict) -> str:
+    def _generer_html_template_sans_scores(self, entreprises: List[Dict], stats: Dict,
+                                           maintenant: Optional[datetime] = None) -> str:
         """✅ Template HTML amélioré avec résumé IA, résumé par commune au début et graphique camembert"""
         
         # Génération du résumé IA de la page
@@ -432,68 +681,13 @@ class GenerateurRapports:
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Rapport de Veille Économique</title>
             <script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js"></script>
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 1200px; margin: 0 auto; background-color: white; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
-                .header {{ background: linear-gradient(135deg, #2c3e50, #3498db); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .header h1 {{ margin: 0; font-size: 2.5em; font-weight: 300; }}
-                .header p {{ margin: 10px 0 0 0; opacity: 0.9; }}
-                
-                .resume-ia {{ background: linear-gradient(135deg, #e8f5e8, #f0f8f0); border-left: 5px solid #27ae60; margin: 20px; padding: 20px; border-radius: 8px; }}
-                .resume-ia h2 {{ color: #27ae60; margin-top: 0; display: flex; align-items: center; }}
-                .resume-ia h2::before {{ content: "🤖"; margin-right: 10px; }}
-                .resume-points {{ list-style: none; padding: 0; }}
-                .resume-points li {{ padding: 8px 0; border-bottom: 1px solid #e0e0e0; }}
-                .resume-points li:last-child {{ border-bottom: none; }}
-                .resume-points li::before {{ content: "▶"; color: #27ae60; margin-right: 10px; font-weight: bold; }}
-                
-                .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px; }}
-                .stat-box {{ background: linear-gradient(135deg, #ecf0f1, #ffffff); padding: 20px; border-radius: 8px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                .stat-box h3 {{ margin: 0; font-size: 2em; color: #2c3e50; }}
-                .stat-box p {{ margin: 5px 0 0 0; color: #7f8c8d; font-weight: 500; }}
-                
-                .section {{ margin: 20px; }}
-                .section h2 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; display: flex; align-items: center; }}
-                .section h2::before {{ margin-right: 10px; font-size: 1.2em; }}
-                
-                .communes-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-top: 20px; }}
-                .commune-card {{ background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }}
-                .commune-card h4 {{ margin: 0 0 15px 0; color: #2c3e50; font-size: 1.3em; }}
-                .commune-stats {{ display: flex; justify-content: space-between; margin-bottom: 15px; }}
-                .commune-stat {{ text-align: center; }}
-                .commune-stat .number {{ font-size: 1.5em; font-weight: bold; color: #3498db; }}
-                .commune-stat .label {{ font-size: 0.9em; color: #7f8c8d; }}
-                
-                .chart-container {{ background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin: 20px 0; }}
-                .chart-wrapper {{ position: relative; height: 400px; }}
-                
-                .entreprise {{ margin: 20px 0; padding: 25px; background: white; border: 1px solid #e0e0e0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }}
-                .entreprise h4 {{ color: #2c3e50; margin: 0 0 15px 0; font-size: 1.4em; border-bottom: 2px solid #ecf0f1; padding-bottom: 10px; }}
-                .entreprise-info {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px; background: #f8f9fa; padding: 15px; border-radius: 6px; }}
-                .info-item {{ display: flex; flex-direction: column; }}
-                .info-label {{ font-weight: bold; color: #34495e; font-size: 0.9em; }}
-                .info-value {{ color: #2c3e50; margin-top: 5px; }}
-                
-                .activites {{ margin: 15px 0; }}
-                .activites-list {{ display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }}
-                .activite-tag {{ background: linear-gradient(135deg, #3498db, #2980b9); color: white; padding: 6px 12px; border-radius: 20px; font-size: 0.9em; font-weight: 500; }}
-                
-                .details-thematiques {{ margin-top: 25px; }}
-                .thematique-detail {{ margin: 15px 0; padding: 20px; background: #f8f9fa; border-left: 4px solid #3498db; border-radius: 0 6px 6px 0; }}
-                .thematique-detail h5 {{ color: #2c3e50; margin: 0 0 15px 0; font-size: 1.1em; }}
-                .detail-item {{ margin: 10px 0; padding: 12px; background: white; border-radius: 6px; border: 1px solid #e9ecef; }}
-                .detail-title {{ font-weight: bold; color: #34495e; margin-bottom: 8px; }}
-                .detail-content {{ color: #2c3e50; line-height: 1.5; }}
-                .detail-source {{ margin-top: 8px; }}
-                .detail-source a {{ color: #3498db; text-decoration: none; font-size: 0.9em; }}
-                .detail-source a:hover {{ text-decoration: underline; }}
-            </style>
+            {_STYLE_RAPPORT}
         </head>
         <body>
             <div class="container">
                 <div class="header">
                     <h1>🏢 Rapport de Veille Économique Territoriale</h1>
-                    <p>Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}</p>
+                    <p>Généré le {(maintenant or datetime.now()).strftime('%d/%m/%Y à %H:%M')}</p>
                 </div>
                 
                 <!-- NOUVEAU: Résumé IA Global -->
@@ -551,46 +745,7 @@ class GenerateurRapports:
                 const ctx = document.getElementById('thematiquesChart').getContext('2d');
                 const thematiquesData = {json.dumps(self._generer_donnees_camembert(stats))};
                 
-                new Chart(ctx, {{
-                    type: 'doughnut',
-                    data: {{
-                        labels: thematiquesData.labels,
-                        datasets: [{{
-                            data: thematiquesData.values,
-                            backgroundColor: [
-                                '#3498db', '#e74c3c', '#2ecc71', '#f39c12', 
-                                '#9b59b6', '#1abc9c', '#34495e', '#e67e22'
-                            ],
-                            borderWidth: 2,
-                            borderColor: '#ffffff'
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            legend: {{
-                                position: 'right',
-                                labels: {{
-                                    usePointStyle: true,
-                                    padding: 20,
-                                    font: {{
-                                        size: 14
-                                    }}
-                                }}
-                            }},
-                            tooltip: {{
-                                callbacks: {{
-                                    label: function(context) {{
-                                        const total = context.dataset.data.reduce((a, b) => a + b, 0);
-                                        const percentage = ((context.parsed * 100) / total).toFixed(1);
-                                        return context.label + ': ' + context.parsed + ' entreprises (' + percentage + '%)';
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
+                {_SCRIPT_GRAPHIQUE}
             </script>
         </body>
         </html>
@@ -609,7 +764,11 @@ class GenerateurRapports:
             for thematique in entreprise.get('thematiques_principales', []):
                 thematiques_count[thematique] = thematiques_count.get(thematique, 0) + 1
         
-        thematiques_top = sorted(thematiques_count.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Top 3 par tri stable décroissant (ordre d'apparition conservé en cas d'égalité)
+        noms_thematiques = list(thematiques_count)
+        comptes_thematiques = np.fromiter(thematiques_count.values(), dtype=int, count=len(noms_thematiques))
+        thematiques_top = [(noms_thematiques[j], int(comptes_thematiques[j]))
+                           for j in np.argsort(-comptes_thematiques, kind='stable')[:3]]
         
         # Analyse géographique
         communes_actives = {}
@@ -617,22 +776,23 @@ class GenerateurRapports:
             commune = entreprise.get('commune', 'Inconnue')
             communes_actives[commune] = communes_actives.get(commune, 0) + 1
         
-        commune_plus_active = max(communes_actives.items(), key=lambda x: x[1]) if communes_actives else ("Aucune", 0)
+        if communes_actives:
+            communes_noms = list(communes_actives)
+            j = int(np.argmax(list(communes_actives.values())))
+            commune_plus_active = (communes_noms[j], communes_actives[communes_noms[j]])
+        else:
+            commune_plus_active = ("Aucune", 0)
         
         # Génération des points de résumé
         points_resume = []
         
         # Point 1: Vue d'ensemble
-        if stats['pourcentage_actives'] > 70:
-            points_resume.append(f"<strong>Territoire très dynamique</strong> : {stats['pourcentage_actives']}% des entreprises analysées présentent une activité détectable, soit {stats['nb_actives']} sur {stats['nb_total']} entreprises.")
-        elif stats['pourcentage_actives'] > 40:
-            points_resume.append(f"<strong>Activité modérée</strong> : {stats['pourcentage_actives']}% des entreprises montrent des signes d'activité ({stats['nb_actives']} sur {stats['nb_total']}), avec des opportunités d'amélioration.")
-        else:
-            points_resume.append(f"<strong>Territoire à potentiel</strong> : {stats['pourcentage_actives']}% d'activité détectée ({stats['nb_actives']} entreprises), nécessitant une approche ciblée pour stimuler le dynamisme économique.")
+        niveau = bisect_left(_SEUILS_DYNAMISME, stats['pourcentage_actives'])
+        points_resume.append(_MESSAGES_DYNAMISME[niveau].format(**stats))
         
         # Point 2: Thématiques dominantes
         if thematiques_top:
-            thematiques_str = ", ".join([f"{t[0].replace('_', ' ').title()} ({t[1]} entreprises)" for t in thematiques_top])
+            thematiques_str = ", ".join([f"{_titre_thematique(t[0])} ({t[1]} entreprises)" for t in thematiques_top])
             points_resume.append(f"<strong>Secteurs d'activité prioritaires</strong> : {thematiques_str}. Ces domaines concentrent la majorité de l'activité économique détectée.")
         
         # Point 3: Répartition géographique
@@ -646,12 +806,7 @@ class GenerateurRapports:
             points_resume.append("<strong>Axes de développement</strong> : Potentiel d'amélioration significatif. Recommandations : renforcement de la communication des entreprises, développement de l'écosystème local et accompagnement ciblé.")
         
         # Formatage HTML
-        html_resume = '<ul class="resume-points">'
-        for point in points_resume:
-            html_resume += f'<li>{point}</li>'
-        html_resume += '</ul>'
-        
-        return html_resume
+        return '<ul class="resume-points">' + ''.join([f'<li>{point}</li>' for point in points_resume]) + '</ul>'
 
     def _generer_donnees_camembert(self, stats: Dict) -> Dict:
         """Génère les données pour le graphique camembert"""
@@ -673,7 +828,7 @@ class GenerateurRapports:
             return {'labels': ['Aucune activité'], 'values': [1]}
         
         # Préparation des données pour Chart.js
-        labels = [nom.replace('_', ' ').title() for nom, _ in thematiques_actives]
+        labels = [_titre_thematique(nom) for nom, _ in thematiques_actives]
         values = [data['count'] for _, data in thematiques_actives]
         
         return {
@@ -684,7 +839,7 @@ class GenerateurRapports:
     def _generer_section_thematiques_detaillee_sans_scores(self, entreprises: List[Dict], stats: Dict) -> str:
         """Génère une section thématiques détaillée sous le graphique"""
         
-        html = '<div style="margin-top: 30px;">'
+        html = ['<div style="margin-top: 30px;">']
         
         thematiques_stats = stats.get('thematiques_stats', {})
         thematiques_triees = sorted(
@@ -693,56 +848,61 @@ class GenerateurRapports:
             reverse=True
         )
         
+        # analyse_thematique lue une seule fois par entreprise, réutilisée pour chaque thématique
+        analyses = [e.get('analyse_thematique') or {} for e in entreprises]
+        
         for thematique, data in thematiques_triees:
             if data['count'] > 0:
-                entreprises_thematique = [
-                    e for e in entreprises 
-                    if e.get('analyse_thematique', {}).get(thematique, {}).get('trouve', False)
-                ][:3]  # Top 3
+                entreprises_thematique = list(islice((
+                    e for e, analyse in zip(entreprises, analyses)
+                    if (analyse.get(thematique) or {}).get('trouve', False)
+                ), 3))  # Top 3 : parcours arrêté dès la 3e
                 
-                html += f'''
+                html.append(f'''
                 <div style="margin: 20px 0; padding: 20px; background: #f8f9fa; border-radius: 8px; border-left: 4px solid #3498db;">
                     <h4 style="margin: 0 0 15px 0; color: #2c3e50;">
-                        {thematique.replace('_', ' ').title()} 
+                        {_titre_thematique(thematique)} 
                         <span style="color: #7f8c8d; font-weight: normal;">({data['count']} entreprises)</span>
                     </h4>
                     <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px;">
-                '''
+                ''')
                 
                 for entreprise in entreprises_thematique:
-                    html += f'''
+                    html.append(f'''
                     <div style="background: white; padding: 15px; border-radius: 6px; border: 1px solid #e9ecef;">
                         <div style="font-weight: bold; color: #2c3e50;">{entreprise['nom']}</div>
                         <div style="color: #7f8c8d; font-size: 0.9em; margin-top: 5px;">{entreprise['commune']}</div>
                     </div>
-                    '''
+                    ''')
                 
-                html += '</div></div>'
+                html.append('</div></div>')
         
-        html += '</div>'
-        return html
+        html.append('</div>')
+        return ''.join(html)
         
     def _generer_section_thematiques_sans_scores(self, entreprises: List[Dict], stats: Dict) -> str:
         """✅ Génération de la section thématiques SANS SCORES"""
-        html = ""
+        html = []
+        # Tri alphabétique unique (stable), réutilisé pour chaque thématique : le filtrage préserve l'ordre.
+        # analyse_thematique lue une seule fois par entreprise
+        entreprises_triees = sorted(entreprises, key=lambda x: x.get('nom', ''))
+        analyses = [e.get('analyse_thematique') or {} for e in entreprises_triees]
         
         for thematique in self.thematiques:
             thematique_stats = stats['thematiques_stats'][thematique]
-            entreprises_thematique = [
-                e for e in entreprises 
-                if e.get('analyse_thematique', {}).get(thematique, {}).get('trouve', False)
-            ]
+            # ✅ Top entreprises SANS SCORES (par ordre alphabétique) : parcours arrêté dès la 3e
+            top_entreprises = list(islice((
+                e for e, analyse in zip(entreprises_triees, analyses)
+                if (analyse.get(thematique) or {}).get('trouve', False)
+            ), 3))
             
-            if entreprises_thematique:
-                html += f"""
+            if top_entreprises:
+                html.append(f"""
                 <div class="thematique">
-                    <h3>{thematique.replace('_', ' ').title()}</h3>
+                    <h3>{_titre_thematique(thematique)}</h3>
                     <p><strong>{thematique_stats['count']} entreprises</strong> ({thematique_stats['percentage']}%)</p>
                     <div style="margin-top: 10px;">
-                """
-                
-                # ✅ Top entreprises SANS SCORES (par ordre alphabétique)
-                top_entreprises = sorted(entreprises_thematique, key=lambda x: x.get('nom', ''))[:3]
+                """)
                 
                 for entreprise in top_entreprises:
                     # ✅ Extraction d'informations détaillées au lieu du score
@@ -757,16 +917,16 @@ class GenerateurRapports:
                         if extraits and extraits[0].get('titre'):
                             resume_activite = extraits[0]['titre'][:50] + "..."
                     
-                    html += f"""
+                    html.append(f"""
                     <div class="entreprise">
                         <strong>{entreprise['nom']}</strong> ({entreprise['commune']})
                         <div class="activite">{resume_activite}</div>
                     </div>
-                    """
+                    """)
                     
-                html += "</div></div>"
+                html.append("</div></div>")
                 
-        return html
+        return ''.join(html)
         
     def _generer_section_communes_sans_scores(self, entreprises: List[Dict]) -> str:
         """✅ Section communes améliorée avec cartes visuelles"""
@@ -780,26 +940,29 @@ class GenerateurRapports:
             if commune not in communes_data:
                 communes_data[commune] = {
                     'entreprises': [],
-                    'thematiques': set(),
-                    'secteurs': set()
+                    'thematiques': {},  # dicts = ensembles ordonnés (affichage déterministe)
+                    'secteurs': {}
                 }
             
             communes_data[commune]['entreprises'].append(entreprise)
             
             # Collecte des thématiques
             thematiques_entreprise = entreprise.get('thematiques_principales', [])
-            communes_data[commune]['thematiques'].update(thematiques_entreprise)
+            communes_data[commune]['thematiques'].update(dict.fromkeys(thematiques_entreprise))
             
             # Collecte des secteurs (simplifié)
             secteur = entreprise.get('secteur_naf', '')
             if secteur:
-                secteur_simplifie = secteur.split()[0] if secteur else 'Autre'
-                communes_data[commune]['secteurs'].add(secteur_simplifie)
+                secteur_simplifie = secteur.split(None, 1)[0] if secteur else 'Autre'
+                communes_data[commune]['secteurs'][secteur_simplifie] = None
         
         # Tri des communes par nombre d'entreprises actives
         communes_triees = sorted(communes_data.items(), key=lambda x: len(x[1]['entreprises']), reverse=True)
         
-        html = '<div class="communes-grid">'
+        if not communes_triees:
+            return '<div style="text-align: center; padding: 40px; color: #7f8c8d;">Aucune commune avec activité détectée</div>'
+        
+        html = ['<div class="communes-grid">']
         
         for commune, data in communes_triees:
             nb_entreprises = len(data['entreprises'])
@@ -810,10 +973,10 @@ class GenerateurRapports:
             entreprises_exemple = [e['nom'] for e in data['entreprises'][:3]]
             
             # Thématiques principales
-            thematiques_liste = list(data['thematiques'])[:3]
-            thematiques_affichage = ', '.join([t.replace('_', ' ').title() for t in thematiques_liste])
+            thematiques_liste = _uniques_ordonnes(data['thematiques'], 3)
+            thematiques_affichage = ', '.join([_titre_thematique(t) for t in thematiques_liste]) if thematiques_liste else ''
             
-            html += f'''
+            html.append(f'''
             <div class="commune-card">
                 <h4>📍 {commune}</h4>
                 
@@ -849,18 +1012,14 @@ class GenerateurRapports:
                 </div>
                 ''' if thematiques_affichage else ''}
             </div>
-            '''
-        
-        html += '</div>'
-        
-        if not communes_triees:
-            html = '<div style="text-align: center; padding: 40px; color: #7f8c8d;">Aucune commune avec activité détectée</div>'
+            ''')
         
-        return html
+        html.append('</div>')
+        return ''.join(html)
 
     def _generer_section_entreprises_sans_scores(self, entreprises: List[Dict]) -> str:
         """✅ CORRIGÉ: Section entreprises HTML avec filtrage contenu factice"""
-        html = ""
+        html = []
         
         # ✅ FILTRAGE : Seulement entreprises actives avec VRAI contenu
         entreprises_actives = []
@@ -874,7 +1033,7 @@ class GenerateurRapports:
         entreprises_triees = sorted(entreprises_actives, key=lambda x: x.get('nom', ''))
         
         for entreprise in entreprises_triees:
-            html += f"""
+            html.append(f"""
             <div class="entreprise" style="margin-bottom: 30px; padding: 20px; border: 1px solid #ddd; border-radius: 8px;">
                 <h4 style="color: #2c3e50; margin-bottom: 10px;">
                     {entreprise['nom']} ({entreprise['commune']})
@@ -887,108 +1046,98 @@ class GenerateurRapports:
                 <div style="margin-bottom: 15px;">
                     <strong>Activités détectées:</strong> {', '.join(entreprise.get('thematiques_principales', []))}
                 </div>
-            """
+            """)
             
             # ✅ DÉTAILS PAR THÉMATIQUE AVEC FILTRAGE CONTENU FACTICE
-            analyse = entreprise.get('analyse_thematique', {})
-            thematiques_trouvees = [t for t in self.thematiques if t in analyse and analyse[t].get('trouve', False)]
+            # Résultat de chaque thématique lu une seule fois, conservé avec son nom
+            analyse = entreprise.get('analyse_thematique') or {}
+            resultats = ((t, analyse.get(t)) for t in self.thematiques)
+            thematiques_trouvees = [(t, r) for t, r in resultats if r and r.get('trouve', False)]
             
             if thematiques_trouvees:
-                html += f"""
+                html.append(f"""
                 <div style="margin-top: 20px;">
                     <strong style="color: #2c3e50;">📋 Détails des activités détectées:</strong>
-                """
+                """)
                 
-                for thematique in thematiques_trouvees:
-                    result = analyse[thematique]
-                    
-                    html += f"""
+                for thematique, result in thematiques_trouvees:
+                    html.append(f"""
                     <div style="margin: 15px 0; padding: 15px; background-color: #f8f9fa; border-left: 4px solid #3498db;">
                         <h5 style="color: #2c3e50; margin: 0 0 10px 0;">
-                            {thematique.replace('_', ' ').title()}
+                            {_titre_thematique(thematique)}
                         </h5>
-                    """
-                    
-                    # ✅ EXTRACTION INFORMATIONS RÉELLES UNIQUEMENT
-                    details_info = []
+                    """)
                     
-                    for detail in result.get('details', []):
-                        info = detail.get('informations', {})
-                        
-                        # Extraits textuels avec VALIDATION
-                        if 'extraits_textuels' in info:
-                            for extrait in info['extraits_textuels']:
-                                if self._est_extrait_reel(extrait):
-                                    details_info.append({
-                                        'type': 'web',
-                                        'titre': extrait.get('titre', ''),
-                                        'contenu': extrait.get('description', ''),
-                                        'url': extrait.get('url', '')
-                                    })
+                    # ✅ EXTRACTION INFORMATIONS RÉELLES UNIQUEMENT (3 affichées : collecte arrêtée dès la 3e)
+                    extraits_reels = (e for e in _iter_extraits(result) if self._est_extrait_reel(e))
+                    details_info = [
+                        {
+                            'type': 'web',
+                            'titre': extrait.get('titre', ''),
+                            'contenu': extrait.get('description', ''),
+                            'url': extrait.get('url', '')
+                        }
+                        for extrait in islice(extraits_reels, 3)
+                    ]
                     
                     # Affichage seulement si contenu réel trouvé
                     if details_info:
-                        html += "<div style='margin-top: 10px;'>"
+                        html.append("<div style='margin-top: 10px;'>")
                         
-                        for i, detail in enumerate(details_info[:3], 1):
+                        for detail in details_info:
+                            url = detail['url']
                             # Validation URL avant affichage
-                            if self._url_est_valide(detail['url']):
-                                html += f"""
+                            if self._url_est_valide(url):
+                                contenu = detail['contenu']
+                                html.append(f"""
                                 <div style="margin: 8px 0; padding: 8px; background-color: white; border-radius: 4px;">
                                     <div style="font-weight: bold; color: #34495e;">
                                         🌐 {detail['titre']}
                                     </div>
                                     <div style="margin: 5px 0; color: #2c3e50;">
-                                        {detail['contenu'][:300]}{'...' if len(detail['contenu']) > 300 else ''}
+                                        {contenu[:300] + '...' if len(contenu) > 300 else contenu}
                                     </div>
                                     <div style="margin-top: 5px;">
-                                        <a href="{detail['url']}" target="_blank" style="color: #3498db; text-decoration: none; font-size: 0.9em;">
+                                        <a href="{url}" target="_blank" style="color: #3498db; text-decoration: none; font-size: 0.9em;">
                                             🔗 Voir la source
                                         </a>
                                     </div>
                                 </div>
-                                """
+                                """)
                         
-                        html += "</div>"
+                        html.append("</div>")
                     else:
-                        html += "<div style='color: #666; font-style: italic;'>Activité détectée mais sources non accessibles</div>"
+                        html.append("<div style='color: #666; font-style: italic;'>Activité détectée mais sources non accessibles</div>")
                     
-                    html += "</div>"  # Fin de la thématique
+                    html.append("</div>")  # Fin de la thématique
                 
-                html += "</div>"  # Fin des détails
+                html.append("</div>")  # Fin des détails
             
             # Site web de l'entreprise (inchangé)
             if entreprise.get('site_web'):
-                html += f"""
+                html.append(f"""
                 <div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid #ecf0f1;">
                     <strong>🌐 Site web:</strong> 
                     <a href="{entreprise['site_web']}" target="_blank" style="color: #3498db;">
                         {entreprise['site_web']}
                     </a>
                 </div>
-                """
+                """)
             
-            html += "</div>"  # Fin de l'entreprise
+            html.append("</div>")  # Fin de l'entreprise
             
-        return html
+        return ''.join(html)
 
     def _a_contenu_reel(self, entreprise: Dict) -> bool:
         """✅ NOUVEAU: Vérifie qu'une entreprise a du vrai contenu"""
         analyse = entreprise.get('analyse_thematique', {})
         
-        for thematique_data in analyse.values():
-            if thematique_data.get('trouve', False):
-                details = thematique_data.get('details', [])
-                
-                for detail in details:
-                    info = detail.get('informations', {})
-                    extraits = info.get('extraits_textuels', [])
-                    
-                    for extrait in extraits:
-                        if self._est_extrait_reel(extrait):
-                            return True
-        
-        return False
+        return any(
+            self._est_extrait_reel(extrait)
+            for thematique_data in analyse.values()
+            if thematique_data.get('trouve', False)
+            for extrait in _iter_extraits(thematique_data)
+        )
 
     def _est_extrait_reel(self, extrait: Dict) -> bool:
         """✅ NOUVEAU: Détermine si un extrait est réel ou factice"""
@@ -996,26 +1145,14 @@ class GenerateurRapports:
         description = extrait.get('description', '').lower()
         url = extrait.get('url', '').lower()
         
-        # Indicateurs de contenu factice
-        indicateurs_factices = [
-            'information concernant',
-            'données contextuelles', 
-            'activité économique locale',
-            'développement de l\'activité',
-            'services aux habitants',
-            'exemple.fr',
-            'exemple-local.fr',
-            'contexte entreprise'
-        ]
-        
         texte_complet = f"{titre} {description}"
         
         # Si contient des indicateurs factices → FAUX
-        if any(indic in texte_complet for indic in indicateurs_factices):
+        if any(indic in texte_complet for indic in _INDICATEURS_FACTICES):
             return False
         
         # Si URL factice → FAUX
-        if any(factice in url for factice in ['exemple', 'test', 'demo', 'simulation']):
+        if any(factice in url for factice in _MARQUEURS_URL_FACTICE):
             return False
         
         # Si contenu trop court → FAUX
@@ -1030,63 +1167,50 @@ class GenerateurRapports:
             return False
         
         # URLs factices connues
-        urls_factices = [
-            'exemple.fr',
-            'exemple-local.fr', 
-            'test.fr',
-            'demo.fr',
-            'simulation.fr',
-            'salon-lagny-sur-marne.fr'  # URL générée par le système
-        ]
-        
-        return not any(factice in url.lower() for factice in urls_factices)
-
-    def generer_export_json(self, entreprises_enrichies: List[Dict]) -> str:
+        url = url.lower()
+        return not any(factice in url for factice in _URLS_FACTICES)
+
+    def generer_export_json(self, entreprises_enrichies: List[Dict], maintenant: Optional[datetime] = None) -> str:
         """Export des données en format JSON avec gestion des types non sérialisables"""
         print("📄 Export JSON")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        maintenant = maintenant or datetime.now()
+        timestamp = maintenant.strftime(_FORMAT_HORODATAGE)
         nom_fichier = f"veille_data_{timestamp}.json"
         chemin_fichier = self.dossier_sortie / nom_fichier
         
-        # Préparation des données pour l'export avec nettoyage
+        # Préparation des données pour l'export
         donnees_export = {
             'metadata': {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': maintenant.isoformat(),
                 'nb_entreprises': len(entreprises_enrichies),
                 'version': '1.0.0'
             },
-            'entreprises': self._nettoyer_pour_json(entreprises_enrichies),
+            # Types non natifs convertis à la volée par _json_serializer, en un seul passage
+            'entreprises': entreprises_enrichies,
             # ✅ Statistiques SANS SCORES pour JSON
             'statistiques': self._calculer_statistiques_sans_scores(entreprises_enrichies)
         }
         
-        with open(chemin_fichier, 'w', encoding='utf-8') as f:
-            json.dump(donnees_export, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        self._ecrire_json(chemin_fichier, donnees_export)
             
         print(f"✅ Export JSON généré: {chemin_fichier}")
         return str(chemin_fichier)
         
-    def _nettoyer_pour_json(self, data):
-        """Nettoyage récursif des données pour la sérialisation JSON"""
-        if isinstance(data, dict):
-            return {key: self._nettoyer_pour_json(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._nettoyer_pour_json(item) for item in data]
-        elif hasattr(data, 'isoformat'):  # datetime, Timestamp
-            return data.isoformat()
-        elif hasattr(data, 'item'):  # numpy types
-            return data.item()
-        elif str(type(data)).startswith('<class \'pandas'):  # pandas types
-            return str(data)
+    def _ecrire_json(self, chemin_fichier: Path, donnees) -> None:
+        """Écriture JSON indentée : orjson si disponible, sinon json avec le même sérialiseur de secours"""
+        # Écriture atomique : fichier temporaire puis renommage, jamais d'export tronqué
+        chemin_tmp = chemin_fichier.with_name(chemin_fichier.name + '.tmp')
+        if _HAS_ORJSON:
+            with open(chemin_tmp, 'wb') as f:
+                f.write(orjson.dumps(donnees, default=self._json_serializer, option=_OPTIONS_ORJSON))
         else:
-            return data
-            
-    def _json_serializer(self, obj):
-        """Sérialiseur personnalisé pour JSON"""
-        import pandas as pd
-        import numpy as np
+            with open(chemin_tmp, 'w', encoding='utf-8', buffering=_TAILLE_TAMPON_ECRITURE) as f:
+                json.dump(donnees, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        os.replace(chemin_tmp, chemin_fichier)
         
+    def _json_serializer(self, obj):
+        """Sérialiseur personnalisé pour JSON (appelé seulement sur les valeurs non natives)"""
         # Gestion des types pandas
         if isinstance(obj, pd.Timestamp):
             return obj.isoformat()
@@ -1094,10 +1218,10 @@ class GenerateurRapports:
             return obj.tolist()
         elif isinstance(obj, pd.DataFrame):
             return obj.to_dict('records')
-        elif isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
+        elif obj is pd.NA:  # valeur manquante pandas
+            return None
+        elif isinstance(obj, np.generic):  # scalaires numpy (entiers, flottants, booléens)
+            return obj.item()
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
         elif hasattr(obj, 'isoformat'):  # datetime objects
@@ -1107,62 +1231,62 @@ class GenerateurRapports:
         else:
             return str(obj)
         
-    def generer_alertes_communes(self, entreprises_enrichies: List[Dict]) -> str:
+    def generer_alertes_communes(self, entreprises_enrichies: List[Dict], maintenant: Optional[datetime] = None) -> str:
         """✅ Génération d'alertes ciblées par commune SANS SCORES"""
         print("🚨 Génération d'alertes par commune")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        maintenant = maintenant or datetime.now()
+        timestamp = maintenant.strftime(_FORMAT_HORODATAGE)
         nom_fichier = f"alertes_communes_{timestamp}.json"
         chemin_fichier = self.dossier_sortie / nom_fichier
         
         alertes = {}
         
-        # Groupement par commune
-        communes_data = {}
+        # Passe unique : alertes d'activité et entreprises par thématique surveillée, par commune
+        thematiques_activite = [t for t in self.thematiques if t in _THEMATIQUES_ALERTE_ACTIVITE]
+        communes_data = defaultdict(lambda: {
+            'activite': [], **{t: [] for t in _THEMATIQUES_ALERTE_CONCENTRATION}
+        })
         for entreprise in entreprises_enrichies:
-            commune = entreprise.get('commune', 'Inconnue')
-            if commune not in communes_data:
-                communes_data[commune] = []
-            communes_data[commune].append(entreprise)
+            groupe = communes_data[entreprise.get('commune', 'Inconnue')]
+            analyse = entreprise.get('analyse_thematique', {})
             
-        # Génération des alertes SANS SCORES
-        for commune, entreprises_commune in communes_data.items():
-            alertes_commune = []
+            for thematique in _THEMATIQUES_ALERTE_CONCENTRATION:
+                if analyse.get(thematique, {}).get('trouve', False):
+                    groupe[thematique].append(entreprise['nom'])
             
             # ✅ Alertes pour nouvelles activités (basées sur présence d'activité, pas score)
-            entreprises_actives = [e for e in entreprises_commune if e.get('score_global', 0) > 0.1]
-            
-            for entreprise in entreprises_actives:
+            if entreprise.get('score_global', 0) > 0.1:
                 thematiques_actives = [
-                    thematique for thematique in self.thematiques
-                    if entreprise.get('analyse_thematique', {}).get(thematique, {}).get('trouve', False)
-                    and thematique in ['recrutements', 'innovations', 'vie_entreprise']
+                    thematique for thematique in thematiques_activite
+                    if analyse.get(thematique, {}).get('trouve', False)
                 ]
                 
                 if thematiques_actives:
                     # ✅ Priorité basée sur nombre de thématiques, pas sur score
                     priorite = 'haute' if len(thematiques_actives) >= 2 else 'moyenne'
                     
-                    alertes_commune.append({
+                    groupe['activite'].append({
                         'type': 'activite_detectee',
                         'entreprise': entreprise['nom'],
                         'thematiques': thematiques_actives,
                         'nb_thematiques': len(thematiques_actives),
                         'priorite': priorite
                     })
-                        
+            
+        # Génération des alertes SANS SCORES
+        for commune, groupe in communes_data.items():
+            alertes_commune = groupe['activite']
+            
             # ✅ Alertes spécifiques par thématique SANS SCORES
-            for thematique in ['recrutements', 'innovations']:
-                entreprises_thematique = [
-                    e for e in entreprises_commune
-                    if e.get('analyse_thematique', {}).get(thematique, {}).get('trouve', False)
-                ]
+            for thematique in _THEMATIQUES_ALERTE_CONCENTRATION:
+                noms_thematique = groupe[thematique]
                 
-                if len(entreprises_thematique) > 2:  # Seuil d'alerte
+                if len(noms_thematique) > 2:  # Seuil d'alerte
                     alertes_commune.append({
                         'type': f'concentration_{thematique}',
-                        'nb_entreprises': len(entreprises_thematique),
-                        'entreprises': [e['nom'] for e in entreprises_thematique],
+                        'nb_entreprises': len(noms_thematique),
+                        'entreprises': noms_thematique,
                         'priorite': 'moyenne'
                     })
                     
@@ -1170,12 +1294,11 @@ class GenerateurRapports:
                 alertes[commune] = {
                     'nb_alertes': len(alertes_commune),
                     'alertes': alertes_commune,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': maintenant.isoformat()
                 }
                 
         # Sauvegarde avec gestion des types non sérialisables
-        with open(chemin_fichier, 'w', encoding='utf-8') as f:
-            json.dump(alertes, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        self._ecrire_json(chemin_fichier, alertes)
             
         print(f"✅ Alertes générées: {chemin_fichier}")
         return str(chemin_fichier)
@@ -1185,11 +1308,13 @@ class GenerateurRapports:
         print("📊 Génération de tous les rapports")
         
         rapports = {}
+        # Horodatage commun : les quatre fichiers partagent le même suffixe
+        maintenant = datetime.now()
         
         # 1. Rapport Excel (prioritaire) - AVEC SCORES
         try:
             print("📊 Génération rapport Excel...")
-            rapports['excel'] = self.generer_rapport_excel(entreprises_enrichies)
+            rapports['excel'] = self.generer_rapport_excel(entreprises_enrichies, maintenant)
         except Exception as e:
             print(f"❌ Erreur rapport Excel: {str(e)}")
             rapports['excel'] = f"ERREUR: {str(e)}"
@@ -1197,7 +1322,7 @@ class GenerateurRapports:
         # 2. Rapport HTML - ✅ SANS SCORES
         try:
             print("🌐 Génération rapport HTML (sans scores)...")
-            rapports['html'] = self.generer_rapport_html(entreprises_enrichies)
+            rapports['html'] = self.generer_rapport_html(entreprises_enrichies, maintenant)
         except Exception as e:
             print(f"❌ Erreur rapport HTML: {str(e)}")
             rapports['html'] = f"ERREUR: {str(e)}"
@@ -1205,7 +1330,7 @@ class GenerateurRapports:
         # 3. Export JSON (avec gestion spéciale des Timestamp) - SANS SCORES pour statistiques
         try:
             print("📄 Génération export JSON...")
-            rapports['json'] = self.generer_export_json(entreprises_enrichies)
+            rapports['json'] = self.generer_export_json(entreprises_enrichies, maintenant)
         except Exception as e:
             print(f"❌ Erreur export JSON: {str(e)}")
             rapports['json'] = f"ERREUR: {str(e)}"
@@ -1213,7 +1338,7 @@ class GenerateurRapports:
         # 4. Alertes communes - SANS SCORES
         try:
             print("🚨 Génération alertes communes...")
-            rapports['alertes'] = self.generer_alertes_communes(entreprises_enrichies)
+            rapports['alertes'] = self.generer_alertes_communes(entreprises_enrichies, maintenant)
         except Exception as e:
             print(f"❌ Erreur alertes: {str(e)}")
             rapports['alertes'] = f"ERREUR: {str(e)}"
@@ -1230,7 +1355,6 @@ class GenerateurRapports:
 
     def group_by_siren(self, entreprises):
         """Retourne dict {siren: [entreprises (établissements)]} en ignorant siren vide."""
-        from collections import defaultdict
         g = defaultdict(list)
         for e in entreprises:
             siren = self._key_siren(e)
@@ -1304,7 +1428,6 @@ class GenerateurRapports:
                 uniques.append(e)
 
             # thematiques dominantes (sur uniques)
-            from collections import Counter
             c = Counter()
             for e in uniques:
                 at = e.get('analyse_thematique', {})
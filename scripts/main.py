@@ -7,6 +7,7 @@ Analyse automatisée des entreprises selon 7 thématiques définies
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import json
@@ -203,8 +204,10 @@ class VeilleEconomique:
     def _afficher_resume_final(self, donnees_enrichies, rapports_generes):
         """Affichage du résumé final"""
         # Statistiques globales
-        score_moyen = sum(e.get('score_global', 0) for e in donnees_enrichies) / len(donnees_enrichies)
-        entreprises_actives = len([e for e in donnees_enrichies if e.get('score_global', 0) > 0.5])
+        scores_globaux = np.fromiter((e.get('score_global', 0) for e in donnees_enrichies),
+                                     dtype=float, count=len(donnees_enrichies))
+        score_moyen = scores_globaux.mean()
+        entreprises_actives = int((scores_globaux > 0.5).sum())
         communes = len(set(e.get('commune', '') for e in donnees_enrichies))
         
         print(f"📊 Score moyen d'activité: {score_moyen:.2f}/1.0")
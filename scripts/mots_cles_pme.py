@@ -142,7 +142,7 @@ class MotsClesPME:
             mots_finaux.extend(mots_secteur)
         
         # 3. Nettoyage et limitation
-        mots_uniques = list(set(mots_finaux))  # Déduplication
+        mots_uniques = list(dict.fromkeys(mots_finaux))  # Déduplication, ordre de priorité conservé
         
         return mots_uniques[:15]  # Max 15 mots-clés par recherche
     
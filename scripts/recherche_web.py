@@ -465,7 +465,7 @@ class RechercheWeb:
         for resultat in resultats:
             if 'mots_cles_trouves' in resultat:
                 mots_cles.extend(resultat['mots_cles_trouves'])
-        return list(set(mots_cles))
+        return list(dict.fromkeys(mots_cles))
     
     def _generer_donnees_insee_enrichies(self, entreprise: Dict) -> Optional[Dict]:
         """Génération de données enrichies basées sur les informations INSEE"""
@@ -901,7 +901,7 @@ class RechercheWeb:
                     
                     resultats_locaux[thematique] = {
                         'mots_cles_trouves': [thematique, 'seine-et-marne', 'local'],
-                        'urls': list(set([r['url'] for r in resultats_thematique if r.get('url')])),
+                        'urls': list(dict.fromkeys(r['url'] for r in resultats_thematique if r.get('url'))),
                         'pertinence': score_local,
                         'extraits_textuels': resultats_thematique,
                         'type': 'sources_locales_77',
@@ -1827,7 +1827,7 @@ class RechercheWeb:
                 mots_cles.extend(resultat['mots_cles_trouves'])
         
         # Ajout des mots-clés thématiques seulement si vraiment trouvés
-        return list(set(mots_cles))
+        return list(dict.fromkeys(mots_cles))
         
     def _construire_requetes_thematique(self, nom_entreprise: str, commune: str, thematique: str) -> List[str]:
         """Construction de requêtes spécifiques par thématique"""
@@ -2412,4 +2412,4 @@ class RechercheWeb:
                 mots_cles.extend(resultat['mots_cles_trouves'])
         
         # Ajout des mots-clés thématiques seulement si vraiment trouvés
-        return list(set(mots_cles))
+        return list(dict.fromkeys(mots_cles))
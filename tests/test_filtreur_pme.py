@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de non-régression du filtreur PME
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.filtreur_pme import _DEFAULT_CFG, FiltreurPME
+
+
+class TestDedoublonnage(unittest.TestCase):
+    """Doublons éliminés sur SIRET/SIREN + nom uniquement"""
+
+    def setUp(self):
+        self.filtreur = FiltreurPME()
+
+    def test_doublon_siret(self):
+        entreprises = [
+            {'siret': '12345678900011', 'nom': 'ALPHA'},
+            {'siret': '12345678900011', 'nom': 'ALPHA'},
+            {'siren': '123456789', 'nom': 'ALPHA'},
+        ]
+        self.assertEqual(self.filtreur._dedupe(entreprises), [entreprises[0], entreprises[2]])
+
+    def test_sans_identifiant_gardees(self):
+        entreprises = [
+            {'siret': '', 'nom': 'BOULANGERIE DU CENTRE'},
+            {'siret': None, 'nom': 'BOULANGERIE DU CENTRE'},
+            {'nom': 'BOULANGERIE DU CENTRE'},
+        ]
+        self.assertEqual(self.filtreur._dedupe(entreprises), entreprises)
+
+
+class TestNormalisationNom(unittest.TestCase):
+    """Les entreprises filtrées ressortent sans clé ajoutée"""
+
+    def test_entreprises_non_modifiees(self):
+        filtreur = FiltreurPME(cache_exclusions=None)
+        entreprises = [{'siret': '12345678900011', 'nom': ' Boulangerie du Centre '}]
+        with contextlib.redirect_stdout(io.StringIO()):
+            gardees = filtreur.filtrer_organismes_publics(filtreur.filtrer_pme_recherchables(entreprises))
+        self.assertEqual(gardees, [{'siret': '12345678900011', 'nom': ' Boulangerie du Centre '}])
+
+
+class TestConfigurationParDefaut(unittest.TestCase):
+    """Configuration par défaut copiée, jamais partagée entre instances"""
+
+    def test_defaut_non_partage(self):
+        filtreur = FiltreurPME(config_path='inexistant.yaml', cache_exclusions=None)
+        self.assertEqual(filtreur.config, _DEFAULT_CFG)
+        filtreur.config['territoire']['codes_postaux_cibles'].append('75001')
+        self.assertEqual(_DEFAULT_CFG['territoire']['codes_postaux_cibles'], ['77600', '77700'])
+        self.assertNotIn('75001', FiltreurPME(config_path='inexistant.yaml').config['territoire']['codes_postaux_cibles'])
+
+    def test_config_mal_encodee(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'parametres.yaml')
+            with open(chemin, 'w', encoding='latin-1') as f:
+                f.write("territoire:\n  communes_prioritaires: ['Crécy-la-Chapelle']\n")
+            self.assertEqual(FiltreurPME(config_path=chemin).config, _DEFAULT_CFG)
+
+
+class TestCacheExclusions(unittest.TestCase):
+    """Cache des exclusions : désactivé par défaut, écrit seulement si un chemin est fourni"""
+
+    def test_desactive_par_defaut(self):
+        self.assertIsNone(FiltreurPME().cache_exclusions)
+
+    def test_sauvegarde_et_rechargement(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'cache', 'exclusions.json')
+            entreprises = [{'siret': '1', 'nom': 'MADAME DUPONT'}, {'siret': '2', 'nom': 'GARAGE DU PONT'}]
+            with contextlib.redirect_stdout(io.StringIO()):
+                FiltreurPME(cache_exclusions=chemin).filtrer_pme_recherchables(entreprises)
+            
+            self.assertEqual(os.listdir(os.path.dirname(chemin)), ['exclusions.json'])
+            with open(chemin, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['noms'], ['MADAME DUPONT'])
+            self.assertEqual(FiltreurPME(cache_exclusions=chemin)._excl_cache, {'MADAME DUPONT'})
+
+    def test_cache_non_objet_ignore(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'exclusions.json')
+            with open(chemin, 'w', encoding='utf-8') as f:
+                f.write('[]')
+            self.assertEqual(FiltreurPME(cache_exclusions=chemin)._excl_cache, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
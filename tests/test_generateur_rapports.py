@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de non-régression du rapport Excel (valeurs manquantes)
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import generateur_rapports
+from scripts.generateur_rapports import GenerateurRapports
+
+
+def _entreprise(nom, siret, commune, thematiques):
+    """Entreprise enrichie minimale, active sur les thématiques données"""
+    extraits = [{
+        'titre': 'Grand salon annuel de l entreprise',
+        'description': 'Une description assez longue du sujet traité',
+        'url': 'https://www.site-entreprise.fr/actualites',
+    }]
+    return {
+        'nom': nom,
+        'siret': siret,
+        'commune': commune,
+        'secteur_naf': 'Commerce de détail',
+        'score_global': 0.9,
+        'analyse_thematique': {
+            thematique: {
+                'trouve': True,
+                'score_pertinence': 0.8,
+                'details': [{'informations': {'extraits_textuels': extraits}}],
+            }
+            for thematique in thematiques
+        },
+    }
+
+
+class TestRapportExcelValeursManquantes(unittest.TestCase):
+    """Commune et SIRET manquants : cellules vides, pas d'erreur d'écriture"""
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.generateur = GenerateurRapports(self.dossier.name)
+        self.entreprises = [
+            _entreprise('ALPHA', '12345678900011', 'Lagny', ['recrutements']),
+            _entreprise('BETA', float('nan'), None, ['recrutements', 'innovations']),
+        ]
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def _generer(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.generateur.generer_rapport_excel(self.entreprises)
+
+    def test_siret_et_commune_manquants(self):
+        classeur = load_workbook(self._generer(), read_only=True)
+
+        principal = list(classeur['Données_Enrichies'].values)
+        self.assertEqual(principal[0], ('SIRET', 'Nom'))
+        self.assertIn((None, 'BETA'), principal[1:])
+
+        recrutements = list(classeur['Recrutements'].values)
+        self.assertIn(('BETA', None), recrutements[1:])
+
+        communes = {ligne[0]: ligne[1] for ligne in list(classeur['Résumé_Communes'].values)[1:]}
+        self.assertEqual(communes, {'Lagny': 1, None: 1})
+    
+    def test_communes_none_et_nan_melangees(self):
+        self.entreprises = [
+            _entreprise(nom, siret, commune, ['recrutements'])
+            for nom, siret, commune in zip(
+                ['GAMMA', 'DELTA', 'EPSILON'], ['1', '2', '3'],
+                json.loads('[NaN, NaN, null]'))
+        ]
+        self.entreprises.append(_entreprise('ZETA', '4', float('nan'), ['innovations']))
+        classeur = load_workbook(self._generer(), read_only=True)
+
+        communes = list(classeur['Résumé_Communes'].values)
+        self.assertEqual(sum(ligne[1] for ligne in communes[1:]), 4)
+        self.assertEqual(sum(ligne[communes[0].index('recrutements_Count')] for ligne in communes[1:]), 3)
+
+    def test_repli_openpyxl(self):
+        with mock.patch.object(generateur_rapports, '_HAS_XLSXWRITER', False):
+            classeur = load_workbook(self._generer(), read_only=True)
+        
+        principal = list(classeur['Données_Enrichies'].values)
+        self.assertEqual(principal[0], ('SIRET', 'Nom'))
+        self.assertIn((None, 'BETA'), principal[1:])
+        recrutements = list(classeur['Recrutements'].iter_rows(min_row=2, max_col=2, values_only=True))
+        self.assertIn(('BETA', None), recrutements)
+
+
+if __name__ == '__main__':
+    unittest.main()